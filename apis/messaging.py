@@ -1,15 +1,39 @@
+import asyncio
 import json
 import logging
+import mimetypes
+import os
 import smtplib
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from email import policy
+from email.generator import BytesGenerator
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from email.mime.application import MIMEApplication
+from string import Template
 from typing import List, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from models.utils import Model
 
+try:
+    import aiosmtplib
+except ImportError:
+    aiosmtplib = None
+
+try:
+    from requests_toolbelt import MultipartEncoder
+except ImportError:
+    MultipartEncoder = None
+
 
 class EmailConfig(Model):
     def __init__(self, username, password, server='smtp.gmail.com', port=587, default_sender=None):
@@ -88,27 +112,245 @@ class EmailConfig(Model):
                 raise KeyError(f"Invalid configuration key: {key}")
 
 
+class AttachmentCache:
+    """
+    Thread-safe LRU cache of ready-to-attach (already base64-encoded) MIME parts.
+
+    Entries are keyed by path, modification time and size, so an edited file is re-read on the next send.
+    Cached parts are shared between messages and must not be modified after being attached.
+    """
+    _default = None
+    _default_lock = threading.Lock()
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024):
+        self.__max_bytes = max_bytes
+        self.__size = 0
+        self.__parts = OrderedDict()
+        self.__lock = threading.Lock()
+
+    @classmethod
+    def default(cls):
+        """Return the process-wide cache shared by every sender that was not given its own."""
+        with cls._default_lock:
+            if cls._default is None:
+                cls._default = cls()
+            return cls._default
+
+    @property
+    def size(self):
+        return self.__size
+
+    def get_part(self, path, inline=False):
+        stat = os.stat(path)
+        key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size, inline)
+        with self.__lock:
+            part = self.__parts.get(key)
+            if part is not None:
+                self.__parts.move_to_end(key)
+                return part
+
+        part = self.build_part(path, inline)
+        part_size = len(part.get_payload())
+        if part_size <= self.__max_bytes:
+            with self.__lock:
+                if key not in self.__parts:
+                    self.__parts[key] = part
+                    self.__size += part_size
+                while self.__size > self.__max_bytes:
+                    _, evicted = self.__parts.popitem(last=False)
+                    self.__size -= len(evicted.get_payload())
+        return part
+
+    @staticmethod
+    def build_part(path, inline=False):
+        with open(path, "rb") as file:
+            data = file.read()
+        part = MIMEApplication(data, Name=path)
+        if not inline:
+            part['Content-Disposition'] = f'attachment; filename="{path}"'
+        else:
+            part.add_header('Content-Disposition', 'inline', filename=path)
+        return part
+
+    def clear(self):
+        with self.__lock:
+            self.__parts.clear()
+            self.__size = 0
+
+
 class MultiPurposeEmailSender:
-    def __init__(self, config: EmailConfig, logger: Optional[logging.Logger] = None):
+    # Keep the original headers untouched, only switch to the CRLF line endings SMTP expects
+    _SMTP_POLICY = policy.compat32.clone(linesep='\r\n')
+
+    def __init__(self, config: EmailConfig, logger: Optional[logging.Logger] = None,
+                 attachment_cache: Optional[AttachmentCache] = None, streaming: bool = False,
+                 spool_max_size: int = 8 * 1024 * 1024):
+        """
+        Parameters:
+            attachment_cache: cache of encoded attachment parts, the process-wide one by default.
+            streaming: write each message to a spooled temp file and stream it to the server instead of
+             building the whole `msg.as_string()` in memory.
+            spool_max_size: bytes kept in memory before the streaming spool rolls over to disk.
+        """
         self.__config = config
         self._logger = logger if logger else logging.getLogger(__name__)
+        self._attachment_cache = attachment_cache if attachment_cache is not None else AttachmentCache.default()
+        self.__streaming = streaming
+        self.__spool_max_size = spool_max_size
+
+    @property
+    def config(self):
+        return self.__config
 
     def send_email(self, subject, body, receivers, attachments=None, inline_attachments=None):
-        msg = self._create_message(subject, body, receivers, attachments, inline_attachments)
         try:
-            self._logger.info(f"Starting the SMTP server {self.__config.server}:{self.__config.port}.")
-            with smtplib.SMTP(self.__config.server, self.__config.port) as server:
-                server.starttls()
-                self._logger.info(f"Logging into the email {self.__config.username}.")
-                server.login(self.__config.username, self.__config.password)
-                self._logger.info(f"Sending the email to {receivers}.")
-                server.sendmail(self.__config.username, receivers, msg.as_string())
-            self._logger.info("Email sent successfully!")
+            self.deliver(subject, body, receivers, attachments, inline_attachments)
         except smtplib.SMTPException as e:
             self._logger.error(f"Error sending email due server issue: {e}")
         except Exception as e:
             self._logger.error(f"Error sending email due unknown issue: {e}")
 
+    def deliver(self, subject, body, receivers, attachments=None, inline_attachments=None):
+        """Same as `send_email` but lets any sending error propagate to the caller."""
+        msg = self._create_message(subject, body, receivers, attachments, inline_attachments)
+        self._send_message(msg, receivers)
+        self._logger.info("Email sent successfully!")
+
+    def send_bulk(self, subject, body, recipients, attachments=None, inline_attachments=None):
+        """
+        Mail-merge one email per recipient and pipeline all of them through a single SMTP session.
+
+        `subject` and `body` are `string.Template` strings (`$name` placeholders, `$$` for a literal `$`).
+        Attachments and, when it has no placeholders, the HTML body are built once and shared by every
+        envelope.
+
+        Parameters:
+            recipients: iterable of (receivers, variables) pairs, where receivers is a list of addresses
+             and variables a dict used to render the templates for that envelope.
+
+        Returns:
+            dict: tuple(receivers) -> exception, for every envelope that could not be sent.
+        """
+        envelopes = [(list(receivers), variables or {}) for receivers, variables in recipients]
+        subject_template = Template(subject)
+        body_template = Template(body)
+        static_body = None if body_template.pattern.search(body) else MIMEText(body, 'html')
+        shared_parts = self._load_parts(attachments) + self._load_parts(inline_attachments, inline=True)
+        self._logger.info(f"Starting bulk send of {len(envelopes)} email(s) with subject: {subject}.")
+
+        failures = {}
+        index, retried = 0, -1
+        while index < len(envelopes):
+            try:
+                with self._smtp_session() as server:
+                    while index < len(envelopes):
+                        receivers, variables = envelopes[index]
+                        try:
+                            msg = MIMEMultipart()
+                            msg['From'] = self.__config.username
+                            msg['To'] = ','.join(receivers)
+                            msg['Subject'] = subject_template.substitute(variables)
+                            msg.attach(static_body or MIMEText(body_template.substitute(variables), 'html'))
+                            for part in shared_parts:
+                                msg.attach(part)
+                            self._transmit(server, msg, receivers)
+                        except smtplib.SMTPServerDisconnected:
+                            raise
+                        except Exception as e:
+                            self._logger.error(f"Error sending bulk email to {receivers}: {e}")
+                            failures[tuple(receivers)] = e
+                        index += 1
+            except smtplib.SMTPServerDisconnected as e:
+                if retried == index:
+                    # Dropped twice on the same envelope, give up on it and carry on with the rest
+                    self._logger.error(f"Error sending bulk email to {envelopes[index][0]}: {e}")
+                    failures[tuple(envelopes[index][0])] = e
+                    index += 1
+                else:
+                    self._logger.warning(f"SMTP session dropped during bulk send ({e}), reconnecting...")
+                    retried = index
+            except Exception as e:
+                self._logger.error(f"Error opening the SMTP session for bulk send: {e}")
+                for receivers, _ in envelopes[index:]:
+                    failures[tuple(receivers)] = e
+                break
+
+        self._logger.info(f"Bulk send finished: {len(envelopes) - len(failures)} sent, {len(failures)} failed.")
+        return failures
+
+    def _load_parts(self, attachments, inline=False):
+        parts = []
+        for attachment in attachments or []:
+            try:
+                parts.append(self._attachment_cache.get_part(attachment, inline=inline))
+            except Exception as e:
+                self._logger.error(f"Error attaching file '{attachment}': {e}")
+        return parts
+
+    def _send_message(self, msg, receivers):
+        with self._smtp_session() as server:
+            self._transmit(server, msg, receivers)
+
+    @contextmanager
+    def _smtp_session(self):
+        self._logger.info(f"Starting the SMTP server {self.__config.server}:{self.__config.port}.")
+        with smtplib.SMTP(self.__config.server, self.__config.port) as server:
+            server.starttls()
+            self._logger.info(f"Logging into the email {self.__config.username}.")
+            server.login(self.__config.username, self.__config.password)
+            yield server
+
+    def _transmit(self, server, msg, receivers):
+        self._logger.info(f"Sending the email to {receivers}.")
+        if not self.__streaming:
+            return server.sendmail(self.__config.username, receivers, msg.as_string())
+
+        with tempfile.SpooledTemporaryFile(max_size=self.__spool_max_size) as spool:
+            BytesGenerator(spool, policy=self._SMTP_POLICY).flatten(msg)
+            spool.seek(0)
+            return self._sendmail_stream(server, receivers, spool)
+
+    def _sendmail_stream(self, server, receivers, spool, chunk_size=65536):
+        """Equivalent of `smtplib.SMTP.sendmail` that streams the DATA section from a CRLF encoded file."""
+        server.ehlo_or_helo_if_needed()
+        code, resp = server.mail(self.__config.username)
+        if code != 250:
+            server.rset()
+            raise smtplib.SMTPSenderRefused(code, resp, self.__config.username)
+
+        refused = {}
+        for receiver in receivers:
+            code, resp = server.rcpt(receiver)
+            if code not in (250, 251):
+                refused[receiver] = (code, resp)
+        if len(refused) == len(receivers):
+            server.rset()
+            raise smtplib.SMTPRecipientsRefused(refused)
+
+        code, resp = server.docmd("data")
+        if code != 354:
+            server.rset()
+            raise smtplib.SMTPDataError(code, resp)
+
+        buffer = bytearray()
+        line = b''
+        for line in iter(spool.readline, b''):
+            if line.startswith(b'.'):
+                buffer += b'.'  # dot-stuffing, RFC 5321 section 4.5.2
+            buffer += line
+            if len(buffer) >= chunk_size:
+                server.send(bytes(buffer))
+                buffer.clear()
+        if not line.endswith(b'\r\n'):
+            buffer += b'\r\n'
+        buffer += b'.\r\n'
+        server.send(bytes(buffer))
+
+        code, resp = server.getreply()
+        if code != 250:
+            raise smtplib.SMTPDataError(code, resp)
+        return refused
+
     def _create_message(self, subject, body, receivers: List[str], attachments=None, inline_attachments=None):
         self._logger.info(f"Start creating the email with subject: {subject}.")
         msg = MIMEMultipart()
@@ -133,14 +375,7 @@ class MultiPurposeEmailSender:
             self._logger.info("Adding the attachments to the email.")
             for attachment in attachments:
                 try:
-                    with open(attachment, "rb") as file:
-                        data = file.read()
-                    part = MIMEApplication(data, Name=attachment)
-                    if not inline:
-                        part['Content-Disposition'] = f'attachment; filename="{attachment}"'
-                    else:
-                        part.add_header('Content-Disposition', 'inline', filename=attachment)
-                    msg.attach(part)
+                    msg.attach(self._attachment_cache.get_part(attachment, inline=inline))
                     self._logger.info(f"Attachment {attachment} was added successfully.")
                 except Exception as e:
                     self._logger.error(f"Error attaching file '{attachment}': {e}")
@@ -149,11 +384,306 @@ class MultiPurposeEmailSender:
             self._logger.info("Attempt to add attachment without providing any.")
 
 
+class SMTPConnectionPool:
+    """
+    Keeps authenticated SMTP sessions alive and hands them out for reuse.
+
+    Idle sessions are health checked with NOOP before being reused (at most once every
+    `health_check_interval` seconds) and are dropped once they stay idle longer than `max_idle`.
+    """
+
+    def __init__(self, config: EmailConfig, size: int = 4, max_idle: float = 60.0,
+                 health_check_interval: float = 5.0, logger=None):
+        if size < 1:
+            raise ValueError("Pool size must be a positive integer.")
+        self.__config = config
+        self.__size = size
+        self.__max_idle = max_idle
+        self.__health_check_interval = health_check_interval
+        self._logger = logger if logger else logging.getLogger(__name__)
+
+        self.__idle = []  # [(server, last_used)]
+        self.__lock = threading.Lock()
+        self.__slots = threading.BoundedSemaphore(size)
+        self.__closed = False
+
+    @property
+    def size(self):
+        return self.__size
+
+    def _connect(self):
+        self._logger.info(f"Starting the SMTP server {self.__config.server}:{self.__config.port}.")
+        server = smtplib.SMTP(self.__config.server, self.__config.port)
+        try:
+            server.starttls()
+            self._logger.info(f"Logging into the email {self.__config.username}.")
+            server.login(self.__config.username, self.__config.password)
+        except Exception:
+            self._discard(server)
+            raise
+        return server
+
+    @staticmethod
+    def _discard(server):
+        try:
+            server.quit()
+        except Exception:
+            server.close()
+
+    @staticmethod
+    def _is_alive(server):
+        try:
+            return server.noop()[0] == 250
+        except smtplib.SMTPException:
+            return False
+        except OSError:
+            return False
+
+    def acquire(self):
+        if self.__closed:
+            raise smtplib.SMTPException("The SMTP connection pool is closed.")
+        self.__slots.acquire()
+        try:
+            while True:
+                with self.__lock:
+                    if not self.__idle:
+                        break
+                    server, last_used = self.__idle.pop()
+                idle_for = time.monotonic() - last_used
+                if idle_for > self.__max_idle:
+                    self._discard(server)
+                elif idle_for < self.__health_check_interval or self._is_alive(server):
+                    return server
+                else:
+                    self._logger.info("Dropping a stale SMTP session from the pool.")
+                    self._discard(server)
+            return self._connect()
+        except Exception:
+            self.__slots.release()
+            raise
+
+    def release(self, server, broken=False):
+        try:
+            if broken or self.__closed:
+                self._discard(server)
+            else:
+                with self.__lock:
+                    self.__idle.append((server, time.monotonic()))
+        finally:
+            self.__slots.release()
+
+    @contextmanager
+    def connection(self):
+        server = self.acquire()
+        broken = False
+        try:
+            yield server
+        except (smtplib.SMTPServerDisconnected, OSError):
+            broken = True
+            raise
+        finally:
+            self.release(server, broken=broken)
+
+    def close(self):
+        self.__closed = True
+        with self.__lock:
+            idle, self.__idle = self.__idle, []
+        for server, _ in idle:
+            self._discard(server)
+        self._logger.info("SMTP connection pool closed successfully.")
+
+
+class PooledEmailSender(MultiPurposeEmailSender):
+    """
+    MultiPurposeEmailSender that reuses authenticated SMTP sessions across sends instead of
+    connecting, running STARTTLS and logging in for every single email.
+    """
+
+    def __init__(self, config: EmailConfig, logger: Optional[logging.Logger] = None, pool_size: int = 4,
+                 max_idle: float = 60.0, pool: SMTPConnectionPool = None,
+                 attachment_cache: Optional[AttachmentCache] = None, streaming: bool = False):
+        super().__init__(config, logger, attachment_cache=attachment_cache, streaming=streaming)
+        self.__pool = pool if pool else SMTPConnectionPool(
+            config, size=pool_size, max_idle=max_idle, logger=self._logger
+        )
+
+    @property
+    def pool(self):
+        return self.__pool
+
+    @contextmanager
+    def _smtp_session(self):
+        with self.__pool.connection() as server:
+            yield server
+
+    def _send_message(self, msg, receivers):
+        try:
+            super()._send_message(msg, receivers)
+        except smtplib.SMTPServerDisconnected as e:
+            # The pooled session died between the health check and the send, retry once on a fresh one.
+            self._logger.warning(f"SMTP session dropped ({e}), reconnecting...")
+            super()._send_message(msg, receivers)
+
+    def close(self):
+        self.__pool.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class AsyncEmailSender:
+    """
+    asyncio counterpart of MultiPurposeEmailSender built on aiosmtplib.
+
+    It is not a MultiPurposeEmailSender: its `send_email`/`deliver` are coroutines, so it cannot stand in
+    for the blocking sender. Messages are built by a MultiPurposeEmailSender (off the event loop),
+    at most `max_concurrency` sends run at once and they share up to `max_connections` authenticated
+    sessions. Set `start_tls=False` to talk to a plain local server such as aiosmtpd; login is skipped
+    when the config has no password.
+    """
+
+    def __init__(self, config: EmailConfig, logger: Optional[logging.Logger] = None, max_concurrency: int = 20,
+                 max_connections: int = 4, start_tls: bool = True, timeout: float = 60.0,
+                 attachment_cache: Optional[AttachmentCache] = None):
+        if aiosmtplib is None:
+            raise ImportError("aiosmtplib is required to use the AsyncEmailSender.")
+        if max_concurrency < 1 or max_connections < 1:
+            raise ValueError("Concurrency and connection limits must be positive integers.")
+        self.__config = config
+        self._logger = logger if logger else logging.getLogger(__name__)
+        # Only builds the messages, it never connects to the server
+        self.__builder = MultiPurposeEmailSender(config, self._logger, attachment_cache=attachment_cache)
+        self.__max_concurrency = max_concurrency
+        self.__max_connections = max_connections
+        self.__start_tls = start_tls
+        self.__timeout = timeout
+
+        # Bound to the running loop on first use
+        self.__semaphore = None
+        self.__slots = None
+        self.__idle = None
+
+    def __ensure_loop_state(self):
+        if self.__semaphore is None:
+            self.__semaphore = asyncio.Semaphore(self.__max_concurrency)
+            self.__slots = asyncio.Semaphore(self.__max_connections)
+            self.__idle = asyncio.LifoQueue()
+
+    @property
+    def config(self):
+        return self.__config
+
+    async def send_email(self, subject, body, receivers, attachments=None, inline_attachments=None):
+        try:
+            await self.deliver(subject, body, receivers, attachments, inline_attachments)
+        except aiosmtplib.SMTPException as e:
+            self._logger.error(f"Error sending email due server issue: {e}")
+        except Exception as e:
+            self._logger.error(f"Error sending email due unknown issue: {e}")
+
+    async def deliver(self, subject, body, receivers, attachments=None, inline_attachments=None):
+        self.__ensure_loop_state()
+        async with self.__semaphore:
+            msg = await asyncio.to_thread(
+                self.__builder._create_message, subject, body, receivers, attachments, inline_attachments
+            )
+            await self._send_message_async(msg, receivers)
+        self._logger.info("Email sent successfully!")
+
+    async def send_many(self, emails):
+        """
+        Send many emails concurrently.
+
+        Parameters:
+            emails: iterable of dicts holding the `send_email` keyword arguments.
+
+        Returns:
+            list: None for every delivered email, or the exception raised while sending it.
+        """
+        return await asyncio.gather(*(self.deliver(**email) for email in emails), return_exceptions=True)
+
+    async def _send_message_async(self, msg, receivers):
+        client = await self.__acquire()
+        broken = False
+        try:
+            self._logger.info(f"Sending the email to {receivers}.")
+            await client.sendmail(self.config.username, receivers, msg.as_string())
+        except (aiosmtplib.SMTPServerDisconnected, aiosmtplib.SMTPConnectError, OSError):
+            broken = True
+            raise
+        finally:
+            await self.__release(client, broken)
+
+    async def __connect(self):
+        self._logger.info(f"Starting the SMTP server {self.config.server}:{self.config.port}.")
+        client = aiosmtplib.SMTP(
+            hostname=self.config.server, port=self.config.port, start_tls=False, timeout=self.__timeout
+        )
+        await client.connect()
+        if self.__start_tls:
+            await client.starttls()
+        if self.config.password:
+            self._logger.info(f"Logging into the email {self.config.username}.")
+            await client.login(self.config.username, self.config.password)
+        return client
+
+    async def __acquire(self):
+        await self.__slots.acquire()
+        try:
+            while not self.__idle.empty():
+                client = self.__idle.get_nowait()
+                try:
+                    await client.noop()
+                    return client
+                except (aiosmtplib.SMTPException, OSError):
+                    await self.__drop(client)
+            return await self.__connect()
+        except Exception:
+            self.__slots.release()
+            raise
+
+    async def __release(self, client, broken=False):
+        try:
+            if broken or not client.is_connected:
+                await self.__drop(client)
+            else:
+                self.__idle.put_nowait(client)
+        finally:
+            self.__slots.release()
+
+    @staticmethod
+    async def __drop(client):
+        try:
+            await client.quit()
+        except Exception:
+            client.close()
+
+    async def close(self):
+        if self.__idle is None:
+            return
+        while not self.__idle.empty():
+            await self.__drop(self.__idle.get_nowait())
+        self._logger.info("Async email sender closed successfully.")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+
 class WCConfig(Model):
-    def __init__(self, url, token, proxies=None):
+    def __init__(self, url, token, proxies=None, pool_size=10, max_retries=3, backoff_factor=0.5, timeout=30):
         self.__url = url
         self.__token = token
         self.__proxies = proxies
+        self.__pool_size = pool_size
+        self.__max_retries = max_retries
+        self.__backoff_factor = backoff_factor
+        self.__timeout = timeout
 
     @property
     def token(self):
@@ -192,6 +722,46 @@ class WCConfig(Model):
             raise ValueError("Proxies must be a dictionary or None.")
         self.__proxies = proxies.copy()
 
+    @property
+    def pool_size(self):
+        return self.__pool_size
+
+    @pool_size.setter
+    def pool_size(self, pool_size):
+        if not isinstance(pool_size, int) or pool_size < 1:
+            raise ValueError("Pool size must be a positive integer.")
+        self.__pool_size = pool_size
+
+    @property
+    def max_retries(self):
+        return self.__max_retries
+
+    @max_retries.setter
+    def max_retries(self, max_retries):
+        if not isinstance(max_retries, int) or max_retries < 0:
+            raise ValueError("Max retries must be a non-negative integer.")
+        self.__max_retries = max_retries
+
+    @property
+    def backoff_factor(self):
+        return self.__backoff_factor
+
+    @backoff_factor.setter
+    def backoff_factor(self, backoff_factor):
+        if not isinstance(backoff_factor, (int, float)) or backoff_factor < 0:
+            raise ValueError("Backoff factor must be a non-negative number.")
+        self.__backoff_factor = backoff_factor
+
+    @property
+    def timeout(self):
+        return self.__timeout
+
+    @timeout.setter
+    def timeout(self, timeout):
+        if timeout is not None and (not isinstance(timeout, (int, float)) or timeout <= 0):
+            raise ValueError("Timeout must be a positive number or None.")
+        self.__timeout = timeout
+
     # Update method for dynamic configuration
     def update_config(self, **kwargs):
         for key, value in kwargs.items():
@@ -214,11 +784,61 @@ class WCConfig(Model):
     def set_proxies(self, proxies):
         self.__proxies = proxies.copy()
 
+    def set_pool_size(self, pool_size):
+        self.pool_size = pool_size
+
+    def set_max_retries(self, max_retries):
+        self.max_retries = max_retries
+
+    def set_backoff_factor(self, backoff_factor):
+        self.backoff_factor = backoff_factor
+
+    def set_timeout(self, timeout):
+        self.timeout = timeout
+
 
 class WCSender:
     def __init__(self, config: WCConfig, logger=None):
         self.__config = config
         self._logger = logger if logger else logging.getLogger()
+        self.__session = self._build_session()
+        # Streamed uploads cannot be rewound, so they are never retried once the body started going out
+        self.__upload_session = self._build_session(status_retries=False)
+
+        # Reusable attachment ids of files already uploaded, keyed by path, mtime and size
+        self.__attachment_ids = {}
+        self.__upload_locks = {}
+        self.__upload_locks_lock = threading.Lock()
+
+    @property
+    def session(self):
+        return self.__session
+
+    def _build_session(self, status_retries: bool = True):
+        """
+        Keep-alive session whose connection pool is sized for `send_many` fan-outs.
+        Without `status_retries`, only failures to connect are retried.
+        """
+        retries = Retry(
+            total=self.__config.max_retries,
+            read=0,  # never replay a message the server may already have received
+            status=None if status_retries else 0,
+            backoff_factor=self.__config.backoff_factor,
+            # Only statuses meaning the request was refused; a gateway 502/504 may follow an accepted message
+            status_forcelist=(429, 503),
+            allowed_methods=frozenset(['GET', 'POST']),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=self.__config.pool_size,
+            pool_maxsize=self.__config.pool_size,
+            max_retries=retries,
+        )
+        session = requests.Session()
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.proxies.update(self.__config.proxies)
+        return session
 
     def send_message(self, thread_keys: str, message: str, files: list = None, headers: dict = None):
         if headers is None:
@@ -226,19 +846,20 @@ class WCSender:
         try:
             message_body = {"recipient": {"thread_key": thread_keys}, "message": {"text": message}}
 
-            # Add file attachments if provided
-            if files:
-                message_body['message']['attachment'] = self._attach_files(files)
-
-            r = requests.post(
+            r = self.__session.post(
                 url=f"{self.__config.url}{self.__config.token}",
                 data=json.dumps(message_body),
                 headers=headers,
-                proxies=self.__config.proxies
+                proxies=self.__config.proxies,
+                timeout=self.__config.timeout,
             )
 
             r.raise_for_status()  # Raise HTTPError for bad responses
 
+            # The Send API takes a single attachment per message, so files follow the text one by one
+            if files:
+                self._attach_files(thread_keys, files)
+
             # You can return or handle the response as needed
             return r
         except requests.HTTPError as e:
@@ -250,23 +871,108 @@ class WCSender:
         except Exception as e:
             self._logger.error(f"An unexpected error occurred during the execution of send_message:{e}", )
 
-    def _attach_files(self, files):
-        # Handle file attachments if needed (customize as per your requirements)
-        # This method can be extended to support different types of attachments
-        attachments = []
-        self._logger.info("Adding the attachments to the email.")
+    def send_many(self, thread_keys: list, message: str, files: list = None, headers: dict = None,
+                  max_workers: int = None):
+        """
+        Send the same message to many threads concurrently over the pooled session.
+
+        Returns:
+            dict: thread key -> response, or None when sending to that thread failed.
+        """
+        max_workers = max_workers if max_workers else self.__config.pool_size
+        self._logger.info(f"Sending the WC message to {len(thread_keys)} thread(s) with {max_workers} worker(s).")
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                thread_key: executor.submit(self.send_message, thread_key, message, files, headers)
+                for thread_key in thread_keys
+            }
+        return {thread_key: future.result() for thread_key, future in futures.items()}
+
+    def close(self):
+        self.__session.close()
+        self.__upload_session.close()
+        self._logger.info("WC session closed successfully.")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _attach_files(self, thread_key, files):
+        self._logger.info("Adding the attachments to the message.")
         for file_path in files:
-
             try:
-                file_name = file_path.split('/')[-1]  # Extracting file name from path
-                with open(file_path, 'rb') as file:
-                    file_data = file.read()
-                # attachments.append({"type": "file", "name": file_name, "content": file_data})
-                attachments.append({"type": "file", "name": file_name, "content": file_data})
+                self._send_attachment(thread_key, file_path)
                 self._logger.info(f"Attachment {file_path} was added successfully.")
             except FileNotFoundError:
                 self._logger.error(f"Attachment file not found: {file_path}", )
+            except requests.HTTPError as e:
+                self._logger.error(f"HTTP error while sending the attachment {file_path}: {e.response.text}")
             except Exception as e:
                 self._logger.error(f"Error processing file {file_path}: {e}")
         self._logger.info("All attachments were added successfully to the message.")
-        return attachments
+
+    def _send_attachment(self, thread_key, file_path):
+        stat = os.stat(file_path)
+        key = (os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size)
+        with self.__upload_locks_lock:
+            lock = self.__upload_locks.setdefault(key, threading.Lock())
+
+        # Concurrent sends of the same file wait for the first upload and reuse its attachment id
+        with lock:
+            attachment_id = self.__attachment_ids.get(key)
+            if attachment_id is None:
+                attachment_id = self._upload_attachment(thread_key, file_path)
+                if attachment_id:
+                    self.__attachment_ids[key] = attachment_id
+                return
+
+        message_body = {
+            "recipient": {"thread_key": thread_key},
+            "message": {"attachment": {"type": "file", "payload": {"attachment_id": attachment_id}}},
+        }
+        r = self.__session.post(
+            url=f"{self.__config.url}{self.__config.token}",
+            data=json.dumps(message_body),
+            headers={'Content-type': 'application/json'},
+            proxies=self.__config.proxies,
+            timeout=self.__config.timeout,
+        )
+        r.raise_for_status()
+
+    def _upload_attachment(self, thread_key, file_path):
+        """
+        Send the file to the thread as a streamed multipart/form-data upload marked reusable.
+
+        Returns:
+            str: the attachment id to reference the file in later messages, None if the API did not return one.
+        """
+        file_name = os.path.basename(file_path)
+        content_type = mimetypes.guess_type(file_name)[0] or 'application/octet-stream'
+        fields = {
+            'recipient': json.dumps({"thread_key": thread_key}),
+            'message': json.dumps({"attachment": {"type": "file", "payload": {"is_reusable": True}}}),
+        }
+        self._logger.info(f"Uploading the attachment {file_path}.")
+        with open(file_path, 'rb') as file:
+            if MultipartEncoder is not None:
+                encoder = MultipartEncoder(fields={**fields, 'filedata': (file_name, file, content_type)})
+                r = self.__upload_session.post(
+                    url=f"{self.__config.url}{self.__config.token}",
+                    data=encoder,
+                    headers={'Content-Type': encoder.content_type},
+                    proxies=self.__config.proxies,
+                    timeout=self.__config.timeout,
+                )
+            else:
+                # Without requests_toolbelt the body is still sent as multipart, just buffered by requests
+                r = self.__session.post(
+                    url=f"{self.__config.url}{self.__config.token}",
+                    data=fields,
+                    files={'filedata': (file_name, file, content_type)},
+                    proxies=self.__config.proxies,
+                    timeout=self.__config.timeout,
+                )
+        r.raise_for_status()
+        return r.json().get('attachment_id')
@@ -0,0 +1,201 @@
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+import weakref
+from typing import Optional, List, Union
+
+from apis.messaging import MultiPurposeEmailSender, AsyncEmailSender, WCSender
+from models.utils import Model
+
+
+class Notification(Model):
+    def __init__(self, subject: str, body: str, attachments: Optional[List[str]] = None):
+        self.__subject = subject
+        self.__body = body
+        self.__attachments = list(attachments) if attachments else []
+
+    @property
+    def subject(self):
+        return self.__subject
+
+    @property
+    def body(self):
+        return self.__body
+
+    @property
+    def attachments(self):
+        return self.__attachments.copy()
+
+    def fingerprint(self, channels):
+        digest = hashlib.sha256()
+        for value in (self.__subject, self.__body, *self.__attachments, *sorted(channels)):
+            digest.update(value.encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+
+class EmailChannel:
+    """Delivers notifications by email, with either a blocking or an asyncio email sender."""
+
+    def __init__(self, sender: Union[MultiPurposeEmailSender, AsyncEmailSender], receivers: List[str], concurrency: int = 4):
+        self.__sender = sender
+        self.__receivers = list(receivers)
+        self.concurrency = concurrency
+
+    async def deliver(self, notification: Notification):
+        kwargs = dict(
+            subject=notification.subject, body=notification.body,
+            receivers=self.__receivers, attachments=notification.attachments or None
+        )
+        if isinstance(self.__sender, AsyncEmailSender):
+            await self.__sender.deliver(**kwargs)
+        else:
+            await asyncio.to_thread(self.__sender.deliver, **kwargs)
+
+
+class WCChannel:
+    """Delivers notifications to one or more Workplace chat threads."""
+
+    def __init__(self, sender: WCSender, thread_keys: List[str], concurrency: int = 8):
+        self.__sender = sender
+        self.__thread_keys = list(thread_keys)
+        self.concurrency = concurrency
+
+    async def deliver(self, notification: Notification):
+        text = f"{notification.subject}\n{notification.body}"
+        responses = await asyncio.gather(*(
+            asyncio.to_thread(self.__sender.send_message, thread_key, text, notification.attachments or None)
+            for thread_key in self.__thread_keys
+        ))
+        failed = [key for key, response in zip(self.__thread_keys, responses) if response is None]
+        if failed:
+            raise RuntimeError(f"WC message could not be delivered to thread(s): {failed}")
+
+
+class ChannelMetrics:
+    def __init__(self):
+        self.sent = 0
+        self.failed = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    def record(self, latency: float, ok: bool):
+        if ok:
+            self.sent += 1
+        else:
+            self.failed += 1
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+
+    @property
+    def avg_latency(self):
+        count = self.sent + self.failed
+        return self.total_latency / count if count else 0.0
+
+    def to_dict(self):
+        return {
+            'sent': self.sent,
+            'failed': self.failed,
+            'avg_latency': self.avg_latency,
+            'max_latency': self.max_latency,
+        }
+
+
+class NotificationDispatcher:
+    """
+    Routes a notification to one or more named channels and delivers to all of them concurrently.
+
+    Each channel runs at most `channel.concurrency` deliveries at a time, identical notifications sent
+    to the same channels within `dedup_window` seconds are dropped, and per-channel delivery latency
+    is available through `metrics()`. A notification only counts as sent for deduplication once every
+    channel delivered it.
+    """
+
+    def __init__(self, channels: dict, dedup_window: float = 300.0, logger=None):
+        if not channels:
+            raise ValueError("At least one notification channel must be provided.")
+        self.__channels = dict(channels)
+        self.__dedup_window = dedup_window
+        self._logger = logger if logger else logging.getLogger(__name__)
+
+        self.__recent = {}  # fingerprint -> monotonic time it was last dispatched
+        self.__recent_lock = threading.Lock()
+        self.__metrics = {name: ChannelMetrics() for name in self.__channels}
+        self.__semaphores = weakref.WeakKeyDictionary()  # loop -> {channel: asyncio.Semaphore}
+
+    @property
+    def channels(self):
+        return list(self.__channels)
+
+    def metrics(self):
+        return {name: metrics.to_dict() for name, metrics in self.__metrics.items()}
+
+    def __is_duplicate(self, fingerprint):
+        now = time.monotonic()
+        with self.__recent_lock:
+            expired = [key for key, seen in self.__recent.items() if now - seen > self.__dedup_window]
+            for key in expired:
+                del self.__recent[key]
+            if fingerprint in self.__recent:
+                return True
+            self.__recent[fingerprint] = now
+            return False
+
+    def __forget(self, fingerprint):
+        with self.__recent_lock:
+            self.__recent.pop(fingerprint, None)
+
+    def __semaphore(self, name):
+        semaphores = self.__semaphores.setdefault(asyncio.get_running_loop(), {})
+        if name not in semaphores:
+            semaphores[name] = asyncio.Semaphore(self.__channels[name].concurrency)
+        return semaphores[name]
+
+    async def __deliver(self, name, notification):
+        async with self.__semaphore(name):
+            start = time.perf_counter()
+            try:
+                await self.__channels[name].deliver(notification)
+                self.__metrics[name].record(time.perf_counter() - start, ok=True)
+                self._logger.info(f"Notification '{notification.subject}' delivered through {name}.")
+                return None
+            except Exception as e:
+                self.__metrics[name].record(time.perf_counter() - start, ok=False)
+                self._logger.error(f"Error delivering notification '{notification.subject}' through {name}: {e}")
+                return e
+
+    async def dispatch(self, notification: Notification, channels: Optional[List[str]] = None):
+        """
+        Deliver the notification through the given channels, all of them by default.
+
+        Returns:
+            dict: channel name -> None on success or the raised exception; empty if it was deduplicated.
+        """
+        names = list(channels) if channels else list(self.__channels)
+        unknown = [name for name in names if name not in self.__channels]
+        if unknown:
+            raise KeyError(f"Invalid notification channel(s): {unknown}")
+
+        fingerprint = notification.fingerprint(names) if self.__dedup_window else None
+        if fingerprint and self.__is_duplicate(fingerprint):
+            self._logger.info(f"Skipping duplicate notification '{notification.subject}'.")
+            return {}
+
+        results = await asyncio.gather(*(self.__deliver(name, notification) for name in names))
+        if fingerprint and any(result is not None for result in results):
+            # Let a retry of a notification that did not go through everywhere be delivered again
+            self.__forget(fingerprint)
+        return dict(zip(names, results))
+
+    async def dispatch_many(self, notifications: List[Notification], channels: Optional[List[str]] = None):
+        return await asyncio.gather(*(self.dispatch(notification, channels) for notification in notifications))
+
+    def dispatch_sync(self, notification: Notification, channels: Optional[List[str]] = None):
+        """Blocking helper for callers that are not running an event loop."""
+        return asyncio.run(self.dispatch(notification, channels))
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,304 @@
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from apis.messaging import MultiPurposeEmailSender
+
+
+class RateLimiter:
+    """
+    Process-wide limiter spacing out sends to the same SMTP server.
+    Instances are shared per key, so every outbox talking to the same server respects one budget.
+    """
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, rate: float):
+        if rate <= 0:
+            raise ValueError("Rate must be a positive number of messages per second.")
+        self.__interval = 1.0 / rate
+        self.__next_slot = 0.0
+        self.__lock = threading.Lock()
+
+    @classmethod
+    def for_key(cls, key, rate: float):
+        with cls._instances_lock:
+            if key not in cls._instances:
+                cls._instances[key] = cls(rate)
+            return cls._instances[key]
+
+    def wait(self, stop_event: Optional[threading.Event] = None):
+        with self.__lock:
+            now = time.monotonic()
+            slot = max(now, self.__next_slot)
+            self.__next_slot = slot + self.__interval
+        delay = slot - now
+        if delay > 0:
+            if stop_event:
+                stop_event.wait(delay)
+            else:
+                time.sleep(delay)
+
+
+class EmailSpool:
+    """Durable SQLite store holding every queued email until it is delivered or gives up."""
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+        self.__path = path
+        self.__lock = threading.Lock()
+        self.__conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.__conn.execute("PRAGMA journal_mode=WAL")
+        self.__conn.execute(
+            "CREATE TABLE IF NOT EXISTS outbox ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " payload TEXT NOT NULL,"
+            " status TEXT NOT NULL DEFAULT 'pending',"
+            " attempts INTEGER NOT NULL DEFAULT 0,"
+            " last_error TEXT,"
+            " created_at REAL NOT NULL)"
+        )
+
+    @property
+    def path(self):
+        return self.__path
+
+    def add(self, payload: dict) -> int:
+        with self.__lock:
+            cursor = self.__conn.execute(
+                "INSERT INTO outbox (payload, created_at) VALUES (?, ?)", (json.dumps(payload), time.time())
+            )
+            return cursor.lastrowid
+
+    def get(self, item_id: int):
+        with self.__lock:
+            row = self.__conn.execute("SELECT payload, attempts FROM outbox WHERE id = ?", (item_id,)).fetchone()
+        if row is None:
+            return None, 0
+        return json.loads(row[0]), row[1]
+
+    def pending(self):
+        with self.__lock:
+            rows = self.__conn.execute("SELECT id FROM outbox WHERE status = 'pending' ORDER BY id").fetchall()
+        return [row[0] for row in rows]
+
+    def mark_attempt(self, item_id: int, error: str):
+        with self.__lock:
+            self.__conn.execute(
+                "UPDATE outbox SET attempts = attempts + 1, last_error = ? WHERE id = ?", (error, item_id)
+            )
+
+    def mark_failed(self, item_id: int, error: str):
+        """Keep only the subject and receivers of an abandoned email; its body may hold secrets."""
+        with self.__lock:
+            row = self.__conn.execute("SELECT payload FROM outbox WHERE id = ?", (item_id,)).fetchone()
+            if row is None:
+                return
+            payload = json.loads(row[0])
+            redacted = {'subject': payload.get('subject'), 'receivers': payload.get('receivers')}
+            self.__conn.execute(
+                "UPDATE outbox SET status = 'failed', payload = ?, last_error = ? WHERE id = ?",
+                (json.dumps(redacted), error, item_id)
+            )
+
+    def purge_failed(self, older_than: float) -> int:
+        """Delete the abandoned emails created more than `older_than` seconds ago."""
+        with self.__lock:
+            cursor = self.__conn.execute(
+                "DELETE FROM outbox WHERE status = 'failed' AND created_at < ?", (time.time() - older_than,)
+            )
+            return cursor.rowcount
+
+    def remove(self, item_id: int):
+        with self.__lock:
+            self.__conn.execute("DELETE FROM outbox WHERE id = ?", (item_id,))
+
+    def close(self):
+        with self.__lock:
+            self.__conn.close()
+
+
+class EmailOutbox:
+    """
+    Non-blocking front for a MultiPurposeEmailSender.
+
+    `send_email` spools the email to SQLite and enqueues it; worker threads drain the bounded queue,
+    retry failures with exponential backoff and respect a per-server rate limit. Emails still pending
+    when the process stops are picked up again, in the background, by the next outbox opened on the same
+    spool. Abandoned emails are kept without their body for `failed_retention` seconds.
+    """
+
+    def __init__(self, sender: MultiPurposeEmailSender, spool_path: str = 'run/outbox.sqlite',
+                 queue_size: int = 1000, workers: int = 2, max_retries: int = 5, backoff_base: float = 2.0,
+                 backoff_max: float = 300.0, rate_limit: Optional[float] = None, enqueue_timeout: float = None,
+                 failed_retention: float = 7 * 24 * 3600, logger=None):
+        self._logger = logger if logger else logging.getLogger(__name__)
+        if not isinstance(sender, MultiPurposeEmailSender):
+            # e.g. an AsyncEmailSender, whose deliver() returns a coroutine the workers would never await
+            self._logger.error("The email outbox requires a blocking MultiPurposeEmailSender.")
+            raise TypeError("The email outbox requires a blocking MultiPurposeEmailSender.")
+        self.__sender = sender
+        self.__max_retries = max_retries
+        self.__backoff_base = backoff_base
+        self.__backoff_max = backoff_max
+        self.__enqueue_timeout = enqueue_timeout
+
+        config = sender.config
+        self.__limiter = RateLimiter.for_key((config.server, config.port), rate_limit) if rate_limit else None
+
+        self.__spool = EmailSpool(spool_path)
+        purged = self.__spool.purge_failed(failed_retention)
+        if purged:
+            self._logger.info(f"Purged {purged} abandoned email(s) from the outbox spool.")
+        self.__queue = queue.Queue(maxsize=queue_size)
+        self.__stop = threading.Event()
+        self.__pending = 0
+        self.__pending_cond = threading.Condition()
+        self.__closed = False
+
+        self.__workers = [
+            threading.Thread(target=self.__work, name=f"EmailOutbox-{i}", daemon=True) for i in range(workers)
+        ]
+        for worker in self.__workers:
+            worker.start()
+
+        # Requeued from its own thread so a backlog larger than the queue never blocks the caller
+        # (listed now, before send_email can add rows of its own)
+        self.__recovery = threading.Thread(
+            target=self.__recover, args=(self.__spool.pending(),), name="EmailOutbox-recover", daemon=True
+        )
+        self.__recovery.start()
+
+    @property
+    def spool(self):
+        return self.__spool
+
+    def __recover(self, items):
+        if items:
+            self._logger.info(f"Recovering {len(items)} pending email(s) from the outbox spool.")
+        for item_id in items:
+            while True:
+                if self.__stop.is_set():
+                    return
+                try:
+                    self.__put(item_id, block=True, timeout=0.5)
+                    break
+                except queue.Full:
+                    continue
+
+    def __put(self, item_id, block, timeout=None):
+        with self.__pending_cond:
+            self.__pending += 1
+        try:
+            self.__queue.put(item_id, block=block, timeout=timeout)
+        except queue.Full:
+            self.__done()
+            raise
+
+    def __done(self):
+        with self.__pending_cond:
+            self.__pending -= 1
+            if self.__pending == 0:
+                self.__pending_cond.notify_all()
+
+    def send_email(self, subject, body, receivers, attachments=None, inline_attachments=None):
+        """
+        Queue the email for delivery and return its spool id without waiting on the network.
+
+        Raises:
+            RuntimeError: If the outbox is already closed.
+            queue.Full: If the queue stays full longer than `enqueue_timeout`.
+        """
+        if self.__closed:
+            raise RuntimeError("The email outbox is closed.")
+        payload = {
+            'subject': subject,
+            'body': body,
+            'receivers': list(receivers),
+            'attachments': list(attachments) if attachments else None,
+            'inline_attachments': list(inline_attachments) if inline_attachments else None,
+        }
+        item_id = self.__spool.add(payload)
+        try:
+            self.__put(item_id, block=True, timeout=self.__enqueue_timeout)
+        except queue.Full:
+            self.__spool.remove(item_id)
+            self._logger.error(f"Email outbox is full, dropping the email with subject: {subject}.")
+            raise
+        self._logger.info(f"Email with subject: {subject} queued for delivery (id={item_id}).")
+        return item_id
+
+    def __work(self):
+        while True:
+            item_id = self.__queue.get()
+            try:
+                if item_id is None:
+                    return
+                self.__deliver(item_id)
+            except Exception as e:
+                self._logger.error(f"Unexpected outbox worker error for email {item_id}: {e}")
+            finally:
+                self.__queue.task_done()
+                if item_id is not None:
+                    self.__done()
+
+    def __deliver(self, item_id):
+        payload, attempts = self.__spool.get(item_id)
+        if payload is None:
+            return
+
+        while not self.__stop.is_set():
+            if self.__limiter:
+                self.__limiter.wait(self.__stop)
+            try:
+                self.__sender.deliver(**payload)
+                self.__spool.remove(item_id)
+                return
+            except Exception as e:
+                attempts += 1
+                self.__spool.mark_attempt(item_id, str(e))
+                if attempts > self.__max_retries:
+                    self.__spool.mark_failed(item_id, str(e))
+                    self._logger.error(f"Giving up on email {item_id} after {attempts} attempts: {e}")
+                    return
+                delay = min(self.__backoff_base ** attempts, self.__backoff_max)
+                self._logger.warning(f"Email {item_id} failed (attempt {attempts}), retrying in {delay:.1f}s: {e}")
+                self.__stop.wait(delay)
+
+    def flush(self, timeout: float = None) -> bool:
+        """Block until every queued email is delivered or abandoned. Returns False on timeout."""
+        with self.__pending_cond:
+            return self.__pending_cond.wait_for(lambda: self.__pending == 0, timeout=timeout)
+
+    def close(self, timeout: float = 30.0):
+        """Flush the queue for up to `timeout` seconds, then stop the workers and close the spool."""
+        if self.__closed:
+            return
+        self.__closed = True
+        if not self.flush(timeout):
+            self._logger.warning("Email outbox closed with undelivered emails, they stay spooled for the next run.")
+        self.__stop.set()
+        self.__recovery.join(timeout=5)
+        for _ in self.__workers:
+            self.__queue.put(None)
+        for worker in self.__workers:
+            worker.join(timeout=5)
+        self.__spool.close()
+        self._logger.info("Email outbox closed successfully.")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+if __name__ == "__main__":
+    pass
@@ -1,24 +1,43 @@
+import asyncio
+import codecs
+import hashlib
+import json
 import logging
+import posixpath
+import select
+import shlex
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager, ExitStack
+from stat import S_ISREG
 
 import paramiko
 from sshtunnel import SSHTunnelForwarder, BaseSSHTunnelForwarderError
 from paramiko.ssh_exception import SSHException, AuthenticationException, NoValidConnectionsError
 import os
 
-from models.utils import Model
+from models.utils import Model, Singleton
 
 
 class SSHConfig(Model):
-    def __init__(self, host=None, port=22, username=None, password=None, auth_key=None):
+    def __init__(self, host=None, port=22, username=None, password=None, auth_key=None, auth_key_password=None,
+                 allow_agent=False):
         """
         Parameters:
             auth_key (optional): is the path to your PEM [PEM is a file format that may consist of a certificate
              (aka. public key), a private key or indeed both concatenated together.] if needed.
+             Ed25519, ECDSA and RSA keys are supported.
+            auth_key_password (optional): passphrase of an encrypted auth_key.
+            allow_agent (optional): also try the keys held by the running ssh-agent.
         """
         self.__host = host
         self.__port = port
         self.__username = username
         self.__auth_key = auth_key
+        self.__auth_key_password = auth_key_password
+        self.__allow_agent = allow_agent
         self.__password = password
 
     @property
@@ -65,6 +84,26 @@ class SSHConfig(Model):
             FileNotFoundError(f"Authentication file '{auth_key}' not found.")
         self.__auth_key = auth_key
 
+    @property
+    def auth_key_password(self):
+        return self.__auth_key_password
+
+    @auth_key_password.setter
+    def auth_key_password(self, auth_key_password):
+        if auth_key_password is not None and not isinstance(auth_key_password, str):
+            raise ValueError("SSH Private Key password must be a string or None.")
+        self.__auth_key_password = auth_key_password
+
+    @property
+    def allow_agent(self):
+        return self.__allow_agent
+
+    @allow_agent.setter
+    def allow_agent(self, allow_agent):
+        if not isinstance(allow_agent, bool):
+            raise ValueError("SSH allow agent must be a boolean.")
+        self.__allow_agent = allow_agent
+
     @property
     def password(self):
         return self.__password
@@ -84,36 +123,555 @@ class SSHConfig(Model):
                 raise KeyError(f"Invalid SSH configuration key: {key}")
 
 
+class PrivateKeyCache:
+    """
+    Process-wide cache of parsed (and decrypted) private keys keyed by path, modification time and
+    passphrase, so creating many executors does not re-read and re-parse the same key file.
+    """
+    _KEY_CLASSES = (paramiko.Ed25519Key, paramiko.ECDSAKey, paramiko.RSAKey)
+    _default = None
+    _default_lock = threading.Lock()
+
+    def __init__(self):
+        self.__keys = {}
+        self.__lock = threading.Lock()
+        self.__agent = None
+
+    @classmethod
+    def default(cls):
+        with cls._default_lock:
+            if cls._default is None:
+                cls._default = cls()
+            return cls._default
+
+    def load(self, path, password=None):
+        stat = os.stat(path)
+        secret = hashlib.sha256(password.encode()).hexdigest() if password else None
+        key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size, secret)
+        with self.__lock:
+            if key in self.__keys:
+                return self.__keys[key]
+
+        errors = []
+        for key_class in self._KEY_CLASSES:
+            try:
+                pkey = key_class.from_private_key_file(path, password=password)
+                break
+            except paramiko.PasswordRequiredException:
+                raise
+            except (SSHException, ValueError) as e:
+                errors.append(f"{key_class.__name__}: {e}")
+        else:
+            raise SSHException(f"Unsupported or invalid private key '{path}' ({'; '.join(errors)}).")
+
+        with self.__lock:
+            # Drop entries of older versions of the same file
+            for cached in [cached for cached in self.__keys if cached[0] == key[0] and cached[3] == secret]:
+                del self.__keys[cached]
+            self.__keys[key] = pkey
+        return pkey
+
+    def agent_keys(self):
+        with self.__lock:
+            if self.__agent is None:
+                self.__agent = paramiko.Agent()
+            return list(self.__agent.get_keys())
+
+    def clear(self):
+        with self.__lock:
+            self.__keys.clear()
+            if self.__agent is not None:
+                self.__agent.close()
+                self.__agent = None
+
+
+class _PooledTransport:
+    def __init__(self, transport):
+        self.transport = transport
+        self.active = 0
+        self.last_used = time.monotonic()
+
+    @property
+    def alive(self):
+        return self.transport.is_active() and self.transport.is_authenticated()
+
+
+class SSHTransportPool:
+    """
+    Pool of authenticated SSH transports keyed by (host, port, username, credentials).
+
+    Each transport multiplexes up to `max_channels` concurrent sessions, so many commands can run at
+    once against the same host over a handful of TCP connections. Transports send keepalives and are
+    closed by a background reaper once they stay unused for `idle_timeout` seconds.
+    """
+    _default = None
+    _default_lock = threading.Lock()
+
+    def __init__(self, max_channels: int = 8, max_transports: int = 4, keepalive: int = 30,
+                 idle_timeout: float = 300.0, connect_timeout: float = 30.0, logger=None):
+        self.__max_channels = max_channels
+        self.__max_transports = max_transports
+        self.__keepalive = keepalive
+        self.__idle_timeout = idle_timeout
+        self.__connect_timeout = connect_timeout
+        self._logger = logger if logger else logging.getLogger(__name__)
+
+        self.__transports = {}  # (host, port, username, credentials) -> [_PooledTransport]
+        self.__opening = {}  # (host, port, username, credentials) -> transports being connected
+        self.__cond = threading.Condition()
+        self.__closed = threading.Event()
+        self.__reaper = threading.Thread(target=self.__reap, name="SSHTransportPool-reaper", daemon=True)
+        self.__reaper.start()
+
+    @classmethod
+    def default(cls):
+        """Return the process-wide pool shared by every executor that was not given its own."""
+        with cls._default_lock:
+            if cls._default is None:
+                cls._default = cls()
+            return cls._default
+
+    @property
+    def max_channels(self):
+        return self.__max_channels
+
+    @property
+    def max_transports(self):
+        return self.__max_transports
+
+    @staticmethod
+    def key(config: SSHConfig, pkey=None):
+        """A transport is only shared between configs authenticating with the same credentials."""
+        return config.host, config.port, config.username, SSHTransportPool.credentials_digest(config, pkey)
+
+    @staticmethod
+    def credentials_digest(config: SSHConfig, pkey=None):
+        """Digest of the password, the key (fingerprint, or path when not loaded yet) and the agent use."""
+        digest = hashlib.sha256()
+        for part in (
+            config.password,
+            pkey.get_fingerprint().hex() if pkey is not None else config.auth_key,
+            config.auth_key_password if pkey is None else None,
+            config.allow_agent,
+        ):
+            digest.update(repr(part).encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def _open_transport(self, config: SSHConfig, pkey=None):
+        self._logger.info(f"Opening pooled SSH transport to {config.username}@{config.host}:{config.port}.")
+        transport = paramiko.Transport((config.host, config.port))
+        try:
+            transport.set_keepalive(self.__keepalive)
+            transport.start_client(timeout=self.__connect_timeout)
+            self.__authenticate(transport, config, pkey)
+        except Exception:
+            transport.close()
+            raise
+        return _PooledTransport(transport)
+
+    @staticmethod
+    def __authenticate(transport, config: SSHConfig, pkey=None):
+        keys = [pkey] if pkey is not None else []
+        if config.allow_agent:
+            keys += PrivateKeyCache.default().agent_keys()
+        for key in keys:
+            try:
+                transport.auth_publickey(config.username, key)
+                return
+            except AuthenticationException:
+                continue
+        if config.password is None and keys:
+            raise AuthenticationException(f"No key was accepted for {config.username}@{config.host}.")
+        transport.auth_password(config.username, config.password)
+
+    def __acquire(self, config: SSHConfig, pkey=None):
+        key = self.key(config, pkey)
+        with self.__cond:
+            while True:
+                if self.__closed.is_set():
+                    raise SSHException("The SSH transport pool is closed.")
+                entries = self.__transports.setdefault(key, [])
+                for entry in list(entries):
+                    if not entry.alive:
+                        entries.remove(entry)
+                        entry.transport.close()
+                candidates = [entry for entry in entries if entry.active < self.__max_channels]
+                if candidates:
+                    entry = min(candidates, key=lambda item: item.active)
+                    entry.active += 1
+                    return entry
+                if len(entries) + self.__opening.get(key, 0) < self.__max_transports:
+                    self.__opening[key] = self.__opening.get(key, 0) + 1
+                    break
+                self.__cond.wait()
+
+        try:
+            entry = self._open_transport(config, pkey)
+        finally:
+            with self.__cond:
+                self.__opening[key] -= 1
+                self.__cond.notify_all()
+        with self.__cond:
+            entry.active += 1
+            self.__transports[key].append(entry)
+        return entry
+
+    def __release(self, entry):
+        with self.__cond:
+            entry.active -= 1
+            entry.last_used = time.monotonic()
+            self.__cond.notify_all()
+
+    @contextmanager
+    def channel(self, config: SSHConfig, pkey=None):
+        """Borrow a fresh session channel on a pooled transport for the given host."""
+        entry = self.__acquire(config, pkey)
+        try:
+            chan = entry.transport.open_session()
+        except Exception:
+            self.__release(entry)
+            raise
+        try:
+            yield chan
+        finally:
+            chan.close()
+            self.__release(entry)
+
+    @contextmanager
+    def transport(self, config: SSHConfig, pkey=None):
+        """
+        Borrow a live pooled transport for the host, counted as one active channel until the block exits
+        so the reaper never closes it while the caller still has channels open on it.
+        """
+        entry = self.__acquire(config, pkey)
+        try:
+            yield entry.transport
+        finally:
+            self.__release(entry)
+
+    def evict_idle(self):
+        now = time.monotonic()
+        evicted = []
+        with self.__cond:
+            for key, entries in self.__transports.items():
+                for entry in list(entries):
+                    if not entry.alive or (entry.active == 0 and now - entry.last_used > self.__idle_timeout):
+                        entries.remove(entry)
+                        evicted.append((key, entry))
+        for key, entry in evicted:
+            entry.transport.close()
+            self._logger.info(f"Closed idle pooled SSH transport to {key[2]}@{key[0]}:{key[1]}.")
+        return len(evicted)
+
+    def __reap(self):
+        interval = max(1.0, self.__idle_timeout / 2)
+        while not self.__closed.wait(interval):
+            try:
+                self.evict_idle()
+            except Exception as e:
+                self._logger.error(f"Error evicting idle SSH transports: {e}")
+
+    def close(self):
+        self.__closed.set()
+        with self.__cond:
+            transports, self.__transports = self.__transports, {}
+            self.__cond.notify_all()
+        for entries in transports.values():
+            for entry in entries:
+                entry.transport.close()
+        self._logger.info("SSH transport pool closed successfully.")
+
+
+class _SharedTunnel:
+    def __init__(self, config, pkey=None):
+        self.forwarder = None
+        self.config = config
+        self.pkey = pkey
+        self.local_port = 0
+        self.users = 0
+        # Forwarders handed out before a restart are still released through this entry
+        self.issued = []
+        # Set once the first start attempt is over, `error` holds its failure
+        self.ready = threading.Event()
+        self.error = None
+        # Serializes the restarts of this tunnel only, outside of the registry lock
+        self.lock = threading.Lock()
+
+    def started(self, forwarder):
+        self.forwarder = forwarder
+        self.local_port = forwarder.local_bind_port
+        self.issued.append(forwarder)
+
+
+class SSHTunnelRegistry(metaclass=Singleton):
+    """
+    Process-wide registry of SSH tunnels shared between every SSH client and database engine.
+
+    Tunnels are keyed by the SSH server, the credentials and the remote (host, port) they forward to, so only
+    callers authenticating the same way share one. They are reference counted
+    through `acquire`/`release`, and restarted on the same local port by a monitor thread when their
+    transport dies, so engines holding the local address keep working.
+    """
+
+    def __init__(self, check_interval: float = 30.0):
+        self.__tunnels = {}
+        self.__lock = threading.RLock()
+        self.__check_interval = check_interval
+        self.__monitor = None
+        self.__stop = threading.Event()
+        self._logger = logging.getLogger(__name__)
+
+    @staticmethod
+    def key(config: SSHConfig, remote_bind_address, pkey=None):
+        return (
+            config.host, config.port, config.username, tuple(remote_bind_address),
+            SSHTransportPool.credentials_digest(config, pkey)
+        )
+
+    def __start(self, config: SSHConfig, remote_bind_address, pkey=None, local_port=0):
+        forwarder = SSHTunnelForwarder(
+            (config.host, config.port),
+            ssh_username=config.username,
+            ssh_password=config.password,
+            ssh_pkey=pkey,
+            remote_bind_address=tuple(remote_bind_address),
+            local_bind_address=('127.0.0.1', local_port),
+            allow_agent=config.allow_agent,
+            set_keepalive=30,
+        )
+        forwarder.start()
+        self._logger.info(
+            f"SSH Tunnel {config.host}:{config.port} -> {remote_bind_address[0]}:{remote_bind_address[1]} "
+            f"is open on local port {forwarder.local_bind_port}..."
+        )
+        return forwarder
+
+    def acquire(self, config: SSHConfig, remote_bind_address=('127.0.0.1', 22), pkey=None):
+        """
+        Return a running tunnel to `remote_bind_address`, opening it on first use.
+
+        The SSH handshake runs outside of the registry lock: concurrent callers for the same tunnel wait
+        for the first one to open it, callers for other tunnels are not held up.
+        """
+        if pkey is None and config.auth_key:
+            # Loaded first so the key holds its fingerprint, whether the caller passed the key or only its path
+            pkey = PrivateKeyCache.default().load(config.auth_key, password=config.auth_key_password)
+        key = self.key(config, remote_bind_address, pkey)
+        with self.__lock:
+            entry = self.__tunnels.get(key)
+            opener = entry is None
+            if opener:
+                entry = _SharedTunnel(config, pkey)
+                self.__tunnels[key] = entry
+            entry.users += 1
+            self.__ensure_monitor()
+
+        try:
+            if opener:
+                try:
+                    with entry.lock:
+                        entry.started(self.__start(config, remote_bind_address, pkey))
+                except Exception as e:
+                    entry.error = e
+                    raise
+                finally:
+                    entry.ready.set()
+            else:
+                entry.ready.wait()
+                if entry.error is not None:
+                    raise entry.error
+                with entry.lock:
+                    if not entry.forwarder.is_active:
+                        self.__restart(key, entry)
+            return entry.forwarder
+        except Exception:
+            with self.__lock:
+                entry.users -= 1
+                if entry.users <= 0 and self.__tunnels.get(key) is entry:
+                    del self.__tunnels[key]
+            raise
+
+    def release(self, forwarder):
+        """Drop one user of the tunnel, closing it once nobody uses it anymore."""
+        closing = None
+        with self.__lock:
+            for key, entry in list(self.__tunnels.items()):
+                if any(issued is forwarder for issued in entry.issued):
+                    entry.users -= 1
+                    if entry.users <= 0:
+                        del self.__tunnels[key]
+                        closing = entry
+                    break
+        if closing is not None:
+            with closing.lock:
+                closing.forwarder.stop()
+            self._logger.info(f"Tunnel closed successfully")
+
+    @contextmanager
+    def tunnel(self, config: SSHConfig, remote_bind_address=('127.0.0.1', 22), pkey=None):
+        forwarder = self.acquire(config, remote_bind_address, pkey)
+        try:
+            yield forwarder
+        finally:
+            self.release(forwarder)
+
+    def __restart(self, key, entry):
+        # Called with entry.lock held
+        self._logger.warning(f"SSH Tunnel to {key[3][0]}:{key[3][1]} is down, restarting it...")
+        try:
+            entry.forwarder.stop()
+        except Exception:
+            pass
+        entry.started(self.__start(entry.config, key[3], entry.pkey, local_port=entry.local_port))
+
+    def __ensure_monitor(self):
+        if self.__monitor is None or not self.__monitor.is_alive():
+            self.__monitor = threading.Thread(target=self.__watch, name="SSHTunnelRegistry-monitor", daemon=True)
+            self.__monitor.start()
+
+    def __watch(self):
+        while not self.__stop.wait(self.__check_interval):
+            with self.__lock:
+                tunnels = [(key, entry) for key, entry in self.__tunnels.items() if entry.ready.is_set()]
+            for key, entry in tunnels:
+                try:
+                    with entry.lock:
+                        if entry.forwarder is None or entry.forwarder.is_active:
+                            continue
+                        with self.__lock:
+                            if self.__tunnels.get(key) is not entry:
+                                continue  # released meanwhile
+                        self.__restart(key, entry)
+                except Exception as e:
+                    self._logger.error(f"Error restarting SSH tunnel: {e}")
+
+    def close_all(self):
+        with self.__lock:
+            tunnels, self.__tunnels = self.__tunnels, {}
+        for entry in tunnels.values():
+            if entry.forwarder is not None:
+                entry.forwarder.stop()
+        self._logger.info("All SSH tunnels closed successfully.")
+
+
+class CommandStream:
+    """
+    Incremental reader over a running remote command.
+
+    Iterating yields ('stdout' | 'stderr', text) tuples as output arrives: complete lines without the
+    trailing newline when `lines` is True, raw decoded chunks otherwise. Once the iteration is over
+    `exit_status` holds the command exit code, or None when the server sent none (the channel was closed
+    first, on timeout or by `close`, or the command was killed by a signal). A TimeoutError is raised, and the command's channel
+    closed, when it runs longer than `timeout` seconds.
+    """
+
+    def __init__(self, chan, timeout: float = None, lines: bool = True, chunk_size: int = 32768,
+                 encoding: str = 'utf-8', on_close=None):
+        self.__chan = chan
+        self.__timeout = timeout
+        self.__lines = lines
+        self.__chunk_size = chunk_size
+        self.__encoding = encoding
+        self.__on_close = on_close
+        self.exit_status = None
+
+    def __iter__(self):
+        deadline = time.monotonic() + self.__timeout if self.__timeout else None
+        readers = {
+            'stdout': (self.__chan.recv_ready, self.__chan.recv),
+            'stderr': (self.__chan.recv_stderr_ready, self.__chan.recv_stderr),
+        }
+        decoders = {name: codecs.getincrementaldecoder(self.__encoding)(errors='replace') for name in readers}
+        pending = {name: '' for name in readers}
+        try:
+            while True:
+                # Checked on every iteration, so a command that never stops printing still times out
+                if deadline is not None and time.monotonic() > deadline:
+                    raise TimeoutError(f"Command did not finish within {self.__timeout} seconds.")
+                received = False
+                for name, (ready, recv) in readers.items():
+                    if ready():
+                        received = True
+                        yield from self.__emit(name, decoders[name].decode(recv(self.__chunk_size)), pending)
+                if received:
+                    continue
+                if self.__chan.exit_status_ready() and not self.__chan.recv_ready() \
+                        and not self.__chan.recv_stderr_ready():
+                    break
+                # The channel fd only signals stdout, so poll briefly to also catch stderr
+                select.select([self.__chan], [], [], 0.1)
+
+            for name in readers:
+                yield from self.__emit(name, decoders[name].decode(b'', final=True), pending)
+                if pending[name]:
+                    yield name, pending[name]
+            # paramiko keeps -1 unless the server sent an exit-status, closing the channel also ends the wait
+            if self.__chan.exit_status != -1:
+                self.exit_status = self.__chan.exit_status
+        finally:
+            self.close()
+
+    def __emit(self, name, text, pending):
+        if not text:
+            return
+        if not self.__lines:
+            yield name, text
+            return
+        *complete, pending[name] = (pending[name] + text).split('\n')
+        for line in complete:
+            yield name, line.rstrip('\r')
+
+    def close(self):
+        self.__chan.close()
+        if self.__on_close:
+            on_close, self.__on_close = self.__on_close, None
+            on_close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
 class SSHTunnelCommandExecutor:
-    def __init__(self, config: SSHConfig, logger=None):
+    def __init__(self, config: SSHConfig, logger=None, pool: SSHTransportPool = None):
+        """
+        Parameters:
+            pool (optional): transport pool to run `execute` and `execute_many` on, instead of the single
+             client connected through `connect_client`.
+        """
         self.__config = config
         self.tunnel = None
         self.client = None
+        self.pool = pool
         self._logger = logger if logger else logging.getLogger(__name__)
 
         self.auth_key = None
         self.load_rsa_key(self.__config.auth_key)
 
     @classmethod
-    def build_connection_from_config(cls, config: SSHConfig, logger):
+    def build_connection_from_config(cls, config: SSHConfig, logger, pool: SSHTransportPool = None):
         # Create an SSHTunnelCommandExecutor object using an SSHConfig instance
-        executor = cls(config, logger)
+        executor = cls(config, logger, pool=pool)
         return executor
 
     @classmethod
-    def build_connection_from_dict(cls, config_dict: dict, logger):
+    def build_connection_from_dict(cls, config_dict: dict, logger, pool: SSHTransportPool = None):
         # Create an SSHConfig instance from the provided dictionary
         config = SSHConfig(**config_dict)
 
         # Create an SSHTunnelCommandExecutor object using the SSHConfig instance
-        executor = cls(config, logger)
+        executor = cls(config, logger, pool=pool)
         return executor
 
     def load_rsa_key(self, key):
+        """Load the auth key (Ed25519, ECDSA or RSA) through the process-wide PrivateKeyCache."""
         try:
             if self.__config.auth_key:
-                self.auth_key = paramiko.RSAKey.from_private_key_file(key)
-                self._logger.info(f"RSA Key created successfully.")
+                self.auth_key = PrivateKeyCache.default().load(key, password=self.__config.auth_key_password)
+                self._logger.info(f"{self.auth_key.get_name()} Key loaded successfully.")
         except Exception as e:
             self._logger.error(f"Error loading authentication file: {e}")
             raise Exception(f"Error loading authentication file: {e}")
@@ -129,17 +687,11 @@ class SSHTunnelCommandExecutor:
             raise ValueError("Config must be an SSHConfig instance.")
         self.__config = config
 
-    def open_tunnel(self, ):
+    def open_tunnel(self, remote_bind_address=('127.0.0.1', 22)):
         try:
-            self.tunnel = SSHTunnelForwarder(
-                (self.config.host, self.config.port),
-                ssh_username=self.config.username,
-                ssh_password=self.config.password,
-                ssh_pkey=self.auth_key,
-                remote_bind_address=('127.0.0.1', 22)
-            )
-
-            self.tunnel.start()
+            if self.tunnel is not None:
+                SSHTunnelRegistry().release(self.tunnel)
+            self.tunnel = SSHTunnelRegistry().acquire(self.config, remote_bind_address, self.auth_key)
             self._logger.info(f"SSH Tunnel is open...")
         except BaseSSHTunnelForwarderError as e:
             self._logger.error(f"Error opening SSH tunnel: {e}")
@@ -151,7 +703,7 @@ class SSHTunnelCommandExecutor:
             self.client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
             self._logger.info(f"SSH Client is created")
 
-            if not self.tunnel or self.tunnel.closed:
+            if not self.tunnel or not self.tunnel.is_active:
                 self.open_tunnel()
 
             self.client.connect(
@@ -159,7 +711,8 @@ class SSHTunnelCommandExecutor:
                 port=self.tunnel.local_bind_port,
                 username=self.config.username,
                 password=self.config.password,
-                pkey=self.auth_key
+                pkey=self.auth_key,
+                allow_agent=self.config.allow_agent,
             )
             self._logger.info(f"SSH Client Connected...")
         except (AuthenticationException, SSHException, NoValidConnectionsError) as e:
@@ -167,6 +720,8 @@ class SSHTunnelCommandExecutor:
             raise Exception(f"Error connecting SSH client: {e}")
 
     def execute(self, command):
+        if self.pool is not None:
+            return self._execute_pooled(command)
         if not self.client:
             self._logger.error("SSH Client not connected before execution.")
             raise Exception("SSH Client not connected before execution.")
@@ -178,20 +733,566 @@ class SSHTunnelCommandExecutor:
             self._logger.error(f"Error executing command: {e}")
             raise Exception(f"Error executing command: {e}")
 
+    def _execute_pooled(self, command):
+        try:
+            with self.pool.channel(self.config, self.auth_key) as chan:
+                chan.exec_command(command)
+                stdout = chan.makefile('rb', -1).read()
+                stderr = chan.makefile_stderr('rb', -1).read()
+            return stdout.decode(), stderr.decode()
+        except SSHException as e:
+            self._logger.error(f"Error executing command: {e}")
+            raise Exception(f"Error executing command: {e}")
+
+    def execute_many(self, commands, max_workers: int = 8):
+        """
+        Run the commands concurrently on multiplexed channels of the executor's transport pool.
+
+        Returns:
+            list: (stdout, stderr) tuples in the order of the given commands.
+        """
+        if self.pool is None:
+            self._logger.error("Concurrent execution requires an SSH transport pool.")
+            raise Exception("Concurrent execution requires an SSH transport pool.")
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(self._execute_pooled, commands))
+
+    def execute_stream(self, command, timeout: float = None, lines: bool = True,
+                       chunk_size: int = 32768) -> CommandStream:
+        """
+        Start the command and return a CommandStream yielding its output as it arrives, instead of
+        buffering the whole stdout and stderr like `execute`.
+        """
+        stack = ExitStack()
+        try:
+            if self.pool is not None:
+                chan = stack.enter_context(self.pool.channel(self.config, self.auth_key))
+            elif self.client:
+                chan = self.client.get_transport().open_session()
+            else:
+                self._logger.error("SSH Client not connected before execution.")
+                raise Exception("SSH Client not connected before execution.")
+            chan.exec_command(command)
+        except SSHException as e:
+            stack.close()
+            self._logger.error(f"Error executing command: {e}")
+            raise Exception(f"Error executing command: {e}")
+        except Exception:
+            stack.close()
+            raise
+        return CommandStream(chan, timeout=timeout, lines=lines, chunk_size=chunk_size, on_close=stack.close)
+
+    async def execute_async(self, command):
+        """Run `execute` in a worker thread so the event loop keeps running."""
+        return await asyncio.to_thread(self.execute, command)
+
+    async def execute_stream_async(self, command, timeout: float = None, lines: bool = True,
+                                   max_buffered: int = 1024):
+        """
+        Async generator counterpart of `execute_stream`, yielding ('stdout' | 'stderr', text) tuples.
+        The blocking channel reads run in a worker thread that stays at most `max_buffered` items ahead.
+        """
+        loop = asyncio.get_running_loop()
+        stream = await asyncio.to_thread(self.execute_stream, command, timeout, lines)
+        items = asyncio.Queue()
+        slots = threading.Semaphore(max_buffered)
+        stopped = threading.Event()
+        done = object()
+
+        def pump():
+            try:
+                for item in stream:
+                    slots.acquire()
+                    if stopped.is_set():
+                        break
+                    loop.call_soon_threadsafe(items.put_nowait, item)
+                loop.call_soon_threadsafe(items.put_nowait, done)
+            except Exception as e:
+                loop.call_soon_threadsafe(items.put_nowait, e)
+            finally:
+                stream.close()
+
+        reader = loop.run_in_executor(None, pump)
+        try:
+            while True:
+                item = await items.get()
+                slots.release()
+                if item is done:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            stopped.set()
+            # Closing the channel wakes the pump up even when the command is not printing anything
+            stream.close()
+            slots.release()
+            await reader
+
     def close(self):
         if self.client:
             self.client.close()
             self._logger.info(f"Client closed successfully")
         if self.tunnel:
-            self.tunnel.close()
-            self._logger.info(f"Tunnel closed successfully")
+            SSHTunnelRegistry().release(self.tunnel)
+            self.tunnel = None
+
+
+class HostResult(Model):
+    def __init__(self, host, command, stdout='', stderr='', exit_status=None, error=None, duration=0.0):
+        self.host = host
+        self.command = command
+        self.stdout = stdout
+        self.stderr = stderr
+        self.exit_status = exit_status
+        self.error = error
+        self.duration = duration
+
+    @property
+    def ok(self):
+        return self.error is None and self.exit_status == 0
+
+
+class MultiHostCommandRunner:
+    """
+    Runs a command (or a per-host command map) on many hosts concurrently over pooled SSH transports.
+
+    In best-effort mode every host runs to completion; with `fail_fast` the first failing host
+    cancels every host that has not started yet. Results are HostResult objects keyed by host.
+    """
+
+    def __init__(self, configs, max_workers: int = 16, fail_fast: bool = False, timeout: float = None,
+                 pool: SSHTransportPool = None, logger=None):
+        self._logger = logger if logger else logging.getLogger(__name__)
+        self.__pool = pool if pool else SSHTransportPool.default()
+        self.__executors = {}
+        for config in configs:
+            executor = get_ssh_hook(config, logger=self._logger, pool=self.__pool)
+            self.__executors[executor.config.host] = executor
+        self.__max_workers = max_workers
+        self.__fail_fast = fail_fast
+        self.__timeout = timeout
+
+    @property
+    def hosts(self):
+        return list(self.__executors)
+
+    def __run_on_host(self, host, command, abort: threading.Event):
+        if abort.is_set():
+            return HostResult(host, command, error="Cancelled after a failure on another host (fail-fast).")
+        start = time.monotonic()
+        output = {'stdout': [], 'stderr': []}
+        try:
+            stream = self.__executors[host].execute_stream(command, timeout=self.__timeout, lines=False)
+            for name, chunk in stream:
+                output[name].append(chunk)
+            result = HostResult(host, command, ''.join(output['stdout']), ''.join(output['stderr']),
+                                exit_status=stream.exit_status, duration=time.monotonic() - start)
+        except Exception as e:
+            self._logger.error(f"Error running command on {host}: {e}")
+            result = HostResult(host, command, ''.join(output['stdout']), ''.join(output['stderr']),
+                                error=str(e), duration=time.monotonic() - start)
+        if not result.ok and self.__fail_fast:
+            abort.set()
+        return result
+
+    def run(self, command):
+        """
+        Parameters:
+            command: the command to run on every host, or a dict of host -> command to run only there.
+
+        Returns:
+            dict: host -> HostResult.
+        """
+        commands = command if isinstance(command, dict) else {host: command for host in self.__executors}
+        unknown = [host for host in commands if host not in self.__executors]
+        if unknown:
+            raise KeyError(f"No SSH configuration for host(s): {unknown}")
+
+        self._logger.info(f"Running command on {len(commands)} host(s) with {self.__max_workers} worker(s).")
+        abort = threading.Event()
+        results = {}
+        with ThreadPoolExecutor(max_workers=self.__max_workers) as executor:
+            futures = {
+                executor.submit(self.__run_on_host, host, host_command, abort): host
+                for host, host_command in commands.items()
+            }
+            for future in as_completed(futures):
+                result = future.result()
+                results[result.host] = result
+                if abort.is_set():
+                    for pending in futures:
+                        pending.cancel()
+        for future, host in futures.items():
+            if future.cancelled():
+                results[host] = HostResult(
+                    host, commands[host], error="Cancelled after a failure on another host (fail-fast)."
+                )
+
+        failed = [host for host, result in results.items() if not result.ok]
+        if failed:
+            self._logger.warning(f"Command failed on {len(failed)} host(s): {failed}")
+        return {host: results[host] for host in commands}
+
+
+class SFTPTransfer:
+    """
+    Bulk SFTP transfers over the transport of an SSHTunnelCommandExecutor (pooled or connected client).
+
+    - Reads are pipelined (`readv`) and writes use pipelined mode, so a single stream does not wait for
+      a round trip per 32 KB request.
+    - Files larger than `parallel_threshold` are split into `part_size` ranges moved concurrently, each
+      on its own SFTP channel.
+    - `download_many` / `upload_many` move many files concurrently.
+    - Data goes to a `.part` file renamed once complete. Progress is recorded in a `.sftp-progress` file
+      under `state_dir` (never next to the transferred files), so an interrupted transfer resumes with the
+      missing ranges only, and a destination that already matches in size and modification time (and
+      sha256 when `verify` is set) is skipped.
+    - Each step (stat, range, rename) borrows an SFTP client only for its own duration. At most
+      `max_clients` are open at once, by default the capacity of the executor's pool, or 8 on a single
+      connection (below OpenSSH's default MaxSessions of 10). Idle clients are reused and closed, with
+      their pooled transport reservation, when the outermost transfer call returns.
+    """
+    PART_SUFFIX = '.part'
+    PROGRESS_SUFFIX = '.sftp-progress'
+
+    def __init__(self, executor: 'SSHTunnelCommandExecutor', max_workers: int = 8,
+                 part_size: int = 64 * 1024 * 1024, parallel_threshold: int = 128 * 1024 * 1024,
+                 block_size: int = 4 * 1024 * 1024, verify: bool = False, max_clients: int = None,
+                 state_dir: str = None, logger=None):
+        self.__executor = executor
+        self.__max_workers = max_workers
+        self.__part_size = part_size
+        self.__parallel_threshold = parallel_threshold
+        self.__block_size = block_size
+        self.__verify = verify
+        if max_clients is None:
+            pool = executor.pool
+            max_clients = pool.max_channels * pool.max_transports if pool is not None else 8
+        self.__max_clients = max_clients
+        self.__state_dir = state_dir if state_dir else os.path.join(tempfile.gettempdir(), 'sftp-transfer')
+        self._logger = logger if logger else logging.getLogger(__name__)
+        self.__idle = []  # (client, ExitStack closing it and releasing its pooled transport) not in use
+        self.__open = 0  # clients open, in use or idle
+        self.__cond = threading.Condition()
+        self.__depth = 0  # transfer calls in progress, idle clients are closed when the outermost returns
+
+    def _transport(self, stack: ExitStack):
+        """Transport to open a channel on, reserved in the pool until `stack` is closed."""
+        if self.__executor.pool is not None:
+            return stack.enter_context(self.__executor.pool.transport(self.__executor.config, self.__executor.auth_key))
+        if self.__executor.client:
+            return self.__executor.client.get_transport()
+        self._logger.error("SSH Client not connected before the SFTP transfer.")
+        raise Exception("SSH Client not connected before the SFTP transfer.")
+
+    def __open_client(self):
+        stack = ExitStack()
+        try:
+            sftp = paramiko.SFTPClient.from_transport(self._transport(stack))
+            stack.callback(sftp.close)
+        except Exception:
+            stack.close()
+            raise
+        return sftp, stack
+
+    @staticmethod
+    def __alive(sftp):
+        chan = sftp.get_channel()
+        return not chan.closed and chan.get_transport().is_active()
+
+    @contextmanager
+    def _sftp(self):
+        """
+        Borrow an SFTP client (one channel) for a single step, reusing an idle one when it is still alive.
+        Waits while `max_clients` are open; callers never hold a client while waiting for another.
+        """
+        client, stale = None, []
+        with self.__cond:
+            while True:
+                if self.__idle:
+                    client = self.__idle.pop()
+                    if self.__alive(client[0]):
+                        break
+                    stale.append(client[1])
+                    self.__open -= 1
+                    client = None
+                elif self.__open < self.__max_clients:
+                    self.__open += 1
+                    break
+                else:
+                    self.__cond.wait()
+        for stack in stale:
+            stack.close()
+
+        if client is None:
+            try:
+                client = self.__open_client()
+            except Exception:
+                with self.__cond:
+                    self.__open -= 1
+                    self.__cond.notify()
+                raise
+        try:
+            yield client[0]
+        finally:
+            with self.__cond:
+                self.__idle.append(client)
+                self.__cond.notify()
+
+    def __close_idle(self):
+        with self.__cond:
+            idle, self.__idle = self.__idle, []
+            self.__open -= len(idle)
+            self.__cond.notify_all()
+        for _, stack in idle:
+            stack.close()
+
+    @contextmanager
+    def __session(self):
+        with self.__cond:
+            self.__depth += 1
+        try:
+            yield
+        finally:
+            with self.__cond:
+                self.__depth -= 1
+                outermost = self.__depth == 0
+            if outermost:
+                self.__close_idle()
+
+    def close(self):
+        """Close the idle SFTP clients and release their pooled transports."""
+        self.__close_idle()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __ranges(self, size):
+        if size < self.__parallel_threshold:
+            return [(0, size)]
+        return [(offset, min(self.__part_size, size - offset)) for offset in range(0, size, self.__part_size)]
+
+    def __progress_path(self, direction, source, destination):
+        host = (self.__executor.config.host, self.__executor.config.port)
+        name = hashlib.sha256(repr((direction, host, source, destination)).encode('utf-8')).hexdigest()
+        return os.path.join(self.__state_dir, name + self.PROGRESS_SUFFIX)
+
+    @staticmethod
+    def __load_progress(path, source, size, mtime):
+        try:
+            with open(path, encoding='utf-8') as file:
+                progress = json.load(file)
+            if progress.get('source') == source and progress.get('size') == size and progress.get('mtime') == mtime:
+                return set(progress.get('done', []))
+        except (OSError, ValueError):
+            pass
+        return set()
+
+    @staticmethod
+    def __save_progress(path, source, size, mtime, done):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump({'source': source, 'size': size, 'mtime': mtime, 'done': sorted(done)}, file)
+
+    def _remote_sha256(self, remote_path):
+        stdout, _ = self.__executor.execute(f"sha256sum {shlex.quote(remote_path)}")
+        return stdout.split()[0] if stdout else None
+
+    @staticmethod
+    def _local_sha256(local_path):
+        digest = hashlib.sha256()
+        with open(local_path, 'rb') as file:
+            for block in iter(lambda: file.read(1024 * 1024), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def __is_same(self, local_path, remote_path, local_stat, remote_stat):
+        if local_stat.st_size != remote_stat.st_size or int(local_stat.st_mtime) != int(remote_stat.st_mtime):
+            return False
+        return not self.__verify or self._local_sha256(local_path) == self._remote_sha256(remote_path)
+
+    def __transfer(self, ranges, done, move_range, progress_path, source, size, mtime):
+        lock = threading.Lock()
+        pending = [index for index in range(len(ranges)) if index not in done]
+
+        def run(index):
+            move_range(*ranges[index])
+            with lock:
+                done.add(index)
+                self.__save_progress(progress_path, source, size, mtime, done)
+
+        if len(pending) == 1:
+            run(pending[0])
+        elif pending:
+            with ThreadPoolExecutor(max_workers=self.__max_workers) as executor:
+                for future in [executor.submit(run, index) for index in pending]:
+                    future.result()
+
+    def download(self, remote_path, local_path):
+        """
+        The local file gets the modification time of the remote one.
+
+        Returns:
+            int: bytes transferred, 0 when the local file was already up to date.
+        """
+        with self.__session():
+            return self.__download(remote_path, local_path)
+
+    def __download(self, remote_path, local_path):
+        with self._sftp() as sftp:
+            stat = sftp.stat(remote_path)
+        size, mtime = stat.st_size, int(stat.st_mtime)
+        if os.path.exists(local_path) and self.__is_same(local_path, remote_path, os.stat(local_path), stat):
+            self._logger.info(f"Skipping {remote_path}, {local_path} is already up to date.")
+            return 0
+
+        part_path = local_path + self.PART_SUFFIX
+        progress_path = self.__progress_path('download', remote_path, os.path.abspath(local_path))
+        ranges = self.__ranges(size)
+        done = self.__load_progress(progress_path, remote_path, size, mtime) if os.path.exists(part_path) else set()
+        self._logger.info(f"Downloading {remote_path} to {local_path} in {len(ranges) - len(done)} part(s).")
+
+        fd = os.open(part_path, os.O_WRONLY | os.O_CREAT, 0o644)
+        try:
+            os.ftruncate(fd, size)
+
+            def move_range(offset, length):
+                with self._sftp() as sftp, sftp.open(remote_path, 'rb') as remote:
+                    end = offset + length
+                    while offset < end:
+                        count = min(self.__block_size, end - offset)
+                        for data in remote.readv([(offset, count)]):
+                            os.pwrite(fd, data, offset)
+                            offset += len(data)
+
+            self.__transfer(ranges, done, move_range, progress_path, remote_path, size, mtime)
+        finally:
+            os.close(fd)
+
+        os.utime(part_path, (int(stat.st_atime or mtime), mtime))
+        os.replace(part_path, local_path)
+        if os.path.exists(progress_path):
+            os.remove(progress_path)
+        if self.__verify and self._local_sha256(local_path) != self._remote_sha256(remote_path):
+            self._logger.error(f"Checksum mismatch after downloading {remote_path}.")
+            raise IOError(f"Checksum mismatch after downloading {remote_path}.")
+        self._logger.info(f"Downloaded {remote_path} to {local_path} successfully.")
+        return size
+
+    def upload(self, local_path, remote_path):
+        """
+        The remote file gets the modification time of the local one.
+
+        Returns:
+            int: bytes transferred, 0 when the remote file was already up to date.
+        """
+        with self.__session():
+            return self.__upload(local_path, remote_path)
+
+    def __upload(self, local_path, remote_path):
+        local_stat = os.stat(local_path)
+        size, mtime = local_stat.st_size, int(local_stat.st_mtime)
+        with self._sftp() as sftp:
+            try:
+                remote_stat = sftp.stat(remote_path)
+            except FileNotFoundError:
+                remote_stat = None
+        if remote_stat is not None and self.__is_same(local_path, remote_path, local_stat, remote_stat):
+            self._logger.info(f"Skipping {local_path}, {remote_path} is already up to date.")
+            return 0
+
+        part_path = remote_path + self.PART_SUFFIX
+        progress_path = self.__progress_path('upload', os.path.abspath(local_path), remote_path)
+        ranges = self.__ranges(size)
+        with self._sftp() as sftp:
+            try:
+                sftp.stat(part_path)
+                done = self.__load_progress(progress_path, local_path, size, mtime)
+            except FileNotFoundError:
+                done = set()
+                sftp.open(part_path, 'wb').close()
+            # Drop whatever a previous, different local file left past the current size
+            sftp.truncate(part_path, size)
+        self._logger.info(f"Uploading {local_path} to {remote_path} in {len(ranges) - len(done)} part(s).")
+
+        def move_range(offset, length):
+            with open(local_path, 'rb') as local, self._sftp() as sftp, sftp.open(part_path, 'r+b') as remote:
+                remote.set_pipelined(True)
+                local.seek(offset)
+                remote.seek(offset)
+                remaining = length
+                while remaining > 0:
+                    data = local.read(min(self.__block_size, remaining))
+                    if not data:
+                        break
+                    remote.write(data)
+                    remaining -= len(data)
+
+        self.__transfer(ranges, done, move_range, progress_path, local_path, size, mtime)
+
+        with self._sftp() as sftp:
+            sftp.utime(part_path, (int(local_stat.st_atime), mtime))
+            sftp.posix_rename(part_path, remote_path)
+        if os.path.exists(progress_path):
+            os.remove(progress_path)
+        if self.__verify and self._local_sha256(local_path) != self._remote_sha256(remote_path):
+            self._logger.error(f"Checksum mismatch after uploading {local_path}.")
+            raise IOError(f"Checksum mismatch after uploading {local_path}.")
+        self._logger.info(f"Uploaded {local_path} to {remote_path} successfully.")
+        return size
+
+    def __many(self, method, pairs, max_workers):
+        results = {}
+        with self.__session(), ThreadPoolExecutor(max_workers=max_workers or self.__max_workers) as executor:
+            futures = {executor.submit(method, source, destination): source for source, destination in pairs}
+            for future in as_completed(futures):
+                try:
+                    results[futures[future]] = future.result()
+                except Exception as e:
+                    self._logger.error(f"Error transferring {futures[future]}: {e}")
+                    results[futures[future]] = e
+        return results
+
+    def download_many(self, pairs, max_workers: int = None):
+        """
+        Download many (remote_path, local_path) pairs concurrently.
+
+        Returns:
+            dict: remote path -> bytes transferred, or the exception raised for that file.
+        """
+        return self.__many(self.download, pairs, max_workers)
+
+    def upload_many(self, pairs, max_workers: int = None):
+        """
+        Upload many (local_path, remote_path) pairs concurrently.
+
+        Returns:
+            dict: local path -> bytes transferred, or the exception raised for that file.
+        """
+        return self.__many(self.upload, pairs, max_workers)
+
+    def download_dir(self, remote_dir, local_dir, max_workers: int = None):
+        """Download every regular file directly under `remote_dir` into `local_dir`."""
+        os.makedirs(local_dir, exist_ok=True)
+        with self.__session():
+            with self._sftp() as sftp:
+                pairs = [
+                    (posixpath.join(remote_dir, attr.filename), os.path.join(local_dir, attr.filename))
+                    for attr in sftp.listdir_attr(remote_dir)
+                    if attr.st_mode is not None and S_ISREG(attr.st_mode)
+                ]
+            return self.download_many(pairs, max_workers)
 
 
-def get_ssh_hook(config, logger=None):
+def get_ssh_hook(config, logger=None, pool: SSHTransportPool = None):
     if isinstance(config, dict):
-        conn = SSHTunnelCommandExecutor.build_connection_from_dict(config, logger=logger)
+        conn = SSHTunnelCommandExecutor.build_connection_from_dict(config, logger=logger, pool=pool)
     elif isinstance(config, SSHConfig):
-        conn = SSHTunnelCommandExecutor.build_connection_from_config(config, logger=logger)
+        conn = SSHTunnelCommandExecutor.build_connection_from_config(config, logger=logger, pool=pool)
     else:
         raise TypeError(f"The provided parameter '{type(config)}' is not supported to create a database connection.")
 
@@ -6,6 +6,7 @@ from argparse import Namespace, ArgumentParser
 from PyQt6.QtWidgets import QApplication
 
 from apis.messaging import MultiPurposeEmailSender, EmailConfig
+from apis.outbox import EmailOutbox
 from controllers.app import AppController
 from models.consts import Status
 from models.db import get_db_hook
@@ -35,9 +36,13 @@ def main():
     AppController.set_factory(factory=factory)
     AppController.set_connection(connection=connection)
 
-    emailer = MultiPurposeEmailSender(EmailConfig(
-        **config.get('email', None)
-    ))
+    emailer = EmailOutbox(
+        MultiPurposeEmailSender(EmailConfig(
+            **config.get('email', None)
+        ), logger=logger),
+        spool_path=consts.OUTBOX_SPOOL_PATH,
+        logger=logger
+    )
     AppController.set_emailer(emailer=emailer)
 
     app = QApplication([])
@@ -54,7 +59,7 @@ def main():
         pass
 
     code = app.exec()
-    factory.close(), connection.close()
+    emailer.close(), factory.close(), connection.close()
     sys.exit(code)
 
 
@@ -11,6 +11,7 @@ from sqlalchemy.orm import sessionmaker
 
 from typing import Optional, Dict, Any
 
+from apis.ssh import SSHConfig, SSHTunnelRegistry
 from models.erorrs import DBConfigError
 from models.protcs import QueryConfig, KerberosConfig
 from models.utils import Model
@@ -29,7 +30,12 @@ class DBConfig(Model):
     def __init__(self, delicate: str = 'postgresql', host: str = 'localhost', port: int = 5432,
                  database: Optional[str] = None, username: Optional[str] = None, password: Optional[str] = None,
                  query: Optional[Dict] = None, stream: bool = False, echo: bool = False,
-                 kerberos: Optional[Dict] = None, logger=None):
+                 kerberos: Optional[Dict] = None, ssh: Optional[Dict] = None, logger=None):
+        """
+        Parameters:
+            ssh (optional): SSHConfig keyword arguments of a bastion to reach the database through. The
+             tunnel is shared with every other connection going to the same host and port.
+        """
 
         self._logger = logger if logger else logging.getLogger(__name__)
         # self._encryption_key = Fernet.generate_key()  # TODO: In practice, save this securely and reuse it
@@ -62,6 +68,8 @@ class DBConfig(Model):
         else:
             self._kerberos = None
 
+        self._ssh = SSHConfig(**ssh) if ssh else None
+
     # @property
     # def crypto(self):
     #     """Lazily initialize and return the CryptoHandler."""
@@ -81,6 +89,18 @@ class DBConfig(Model):
             self._logger.error(f"Incorrect Kerberos configuration: {str(e)}")
             raise ValueError(f"Incorrect Kerberos configuration: {str(e)}")
 
+    @property
+    def ssh(self) -> Optional[SSHConfig]:
+        return self._ssh
+
+    @ssh.setter
+    def ssh(self, ssh: Optional[dict]):
+        try:
+            self._ssh = SSHConfig(**ssh) if ssh else None
+        except TypeError as e:
+            self._logger.error(f"Incorrect SSH configuration: {str(e)}")
+            raise ValueError(f"Incorrect SSH configuration: {str(e)}")
+
     @property
     def query(self) -> QueryConfig:
         return self._query
@@ -193,6 +213,7 @@ class DBConnection:
         # SSH Tunnel Variables
         self.__engine = None
         self.__inspector = None
+        self.__tunnel = None
         self.__metadata = MetaData()
 
         self._logger = logger if logger else logging.getLogger()
@@ -240,6 +261,7 @@ class DBConnection:
             stream=config.get('stream'),
             echo=config.get('echo'),
             kerberos=config.get('kerberos'),
+            ssh=config.get('ssh'),
             logger=logger
         )
 
@@ -283,26 +305,34 @@ class DBConnection:
             # self.config.password = None
 
         if self.config.kerberos is not None:
-            self._logger.info(f"Kerberos {self.config.kerberos}")
+            self._logger.info("Kerberos %s", self.config.kerberos)
             cckbs = self.config.kerberos.build_db_connect_args()
-            self._logger.info(f"connect_args: {cckbs}")
+            self._logger.info("connect_args: %s", cckbs)
             connect_args.update(cckbs)
             # query.update(connect_args)
         else:
             connect_args = {}
-        self._logger.info(connect_args)
+        self._logger.info('%s', connect_args)
         # connect_args, query = query, connect_args
 
         query.update(connect_args)
+
+        host, port = self.config.host, self.config.port
+        if self.config.ssh is not None:
+            if self.__tunnel is None:
+                self.__tunnel = SSHTunnelRegistry().acquire(self.config.ssh, (host, port))
+            host, port = '127.0.0.1', self.__tunnel.local_bind_port
+            self._logger.info(f"Routing the connection through the SSH tunnel on local port {port}.")
+
         try:
 
             conn_url = sa.engine.url.URL(
                 drivername=self.config.delicate,
                 username=self.config.username,
                 password=self.config.password,
-                host=self.config.host,
+                host=host,
                 database=self.config.database,
-                port=self.config.port,
+                port=port,
 
                 query=query,
             )
@@ -313,30 +343,49 @@ class DBConnection:
                     drivername=self.config.delicate,
                     username=self.config.username,
                     password=self.config.password,
-                    host=self.config.host,
+                    host=host,
                     database=self.config.database,
-                    port=self.config.port,
+                    port=port,
                     query=query,
                 )
             except Exception as e:
                 self._logger.error(f"Failed to build a URI for the Database.")
+                self.__release_tunnel()
                 raise e
 
-        self._logger.info(f'Connection URI is: {conn_url}')
+        self._logger.info('Connection URI is: %s', conn_url)
+
+        engine_connect_args = {}
+        if self.config.query is not None:
+            engine_connect_args = self.config.query.build_engine_connect_args(self.config.delicate)
 
         try:
             # self.__engine = create_engine(conn_url, connect_args=connect_args, echo=self.config.echo)
-            self.__engine = create_engine(conn_url, echo=self.config.echo)
+            self.__engine = create_engine(conn_url, connect_args=engine_connect_args, echo=self.config.echo)
             if self.config.stream:
                 self.engine.connect().execution_options(stream_results=self.config.stream)
             self._logger.info(f'Database [{self.engine.url.database}] session created...')
         except sa.exc.SQLAlchemyError as e:
             self._logger.error(f"Failed to create engine due database error: {e}")
+            self.__discard_engine()
             raise e
         except Exception as e:
             self._logger.error(f"Failed to create engine due unknown error: {e}")
+            self.__discard_engine()
             raise e
 
+    def __discard_engine(self):
+        # A failed engine must not keep its reference on the shared SSH tunnel
+        if self.__engine is not None:
+            self.__engine.dispose()
+            self.__engine = None
+        self.__release_tunnel()
+
+    def __release_tunnel(self):
+        if self.__tunnel:
+            SSHTunnelRegistry().release(self.__tunnel)
+            self.__tunnel = None
+
     def schemas(self):
         try:
             schemas = self.inspector.get_schema_names()
@@ -367,7 +416,7 @@ class DBConnection:
         :return: DataFrame containing the result set.
         """
         query = text(query)
-        self._logger.info(f'Executing \n{query}\n in progress...')
+        self._logger.info('Executing \n%s\n in progress...', query)
         try:
             query_df = pd.read_sql(
                 query, self.engine, params=params, chunksize=chunk_size
@@ -393,7 +442,7 @@ class DBConnection:
             raise e
 
     def execute(self, sql: str, commit=False):
-        self._logger.info(f'Executing {sql} in progress...')
+        self._logger.info('Executing %s in progress...', sql)
         try:
             with self.engine.connect() as conn:
                 res = conn.execute(text(sql))
@@ -410,6 +459,7 @@ class DBConnection:
         if self.__engine:
             self.engine.dispose()
             self._logger.info('<> Connection Closed Successfully <>')
+        self.__release_tunnel()
 
 
 ################################################################################################################
@@ -1,8 +1,17 @@
+import hashlib
 import os.path
+import re
+import ssl
 import subprocess
+import threading
+import time
+from datetime import datetime
 
 import logging
 
+import requests
+from requests.adapters import HTTPAdapter
+
 from models.utils import Model
 
 try:
@@ -20,10 +29,18 @@ except:
 
 
 class JKSConverter:
+    # Process-wide caches shared by every converter, keystores are content addressed so a
+    # replaced file is reloaded while identical copies are only decrypted once.
+    _digests = {}  # (path, mtime_ns, size) -> sha256 of the keystore content
+    _keystores = {}  # (content sha256, password sha256) -> loaded keystore
+    _pems = {}  # (content sha256, password sha256, alias) -> (private key PEM, certificate PEM)
+    _cache_lock = threading.Lock()
+
     def __init__(self, path, password, logger=None):
         self._logger = logger if logger else logging.getLogger(__name__)
         self.__path = path
         self.__password = password
+        self.__cache_key = None
         self.__keystore = self.__load_keystore()
 
     @property
@@ -52,12 +69,35 @@ class JKSConverter:
 
     def __load_keystore(self):
         try:
+            stat = os.stat(self.__path)
+            stat_key = (os.path.abspath(self.__path), stat.st_mtime_ns, stat.st_size)
+            password_digest = hashlib.sha256((self.__password or '').encode()).hexdigest()
+            with JKSConverter._cache_lock:
+                digest = JKSConverter._digests.get(stat_key)
+                keystore = JKSConverter._keystores.get((digest, password_digest))
+            if keystore is not None:
+                self.__cache_key = (digest, password_digest)
+                self._logger.info("Keystore reused from the process cache.")
+                return keystore
+
             with open(self.__path, 'rb') as f:
                 keystore_data = f.read()
         except IOError as e:
             self._logger.error(f"Error reading keystore file: {e}")
             raise IOError("Error reading keystore file.")
 
+        digest = hashlib.sha256(keystore_data).hexdigest()
+        self.__cache_key = (digest, password_digest)
+        with JKSConverter._cache_lock:
+            JKSConverter._digests[stat_key] = digest
+            keystore = JKSConverter._keystores.get(self.__cache_key)
+        if keystore is None:
+            keystore = self.__parse_keystore(keystore_data)
+            with JKSConverter._cache_lock:
+                JKSConverter._keystores[self.__cache_key] = keystore
+        return keystore
+
+    def __parse_keystore(self, keystore_data):
         try:
             p12 = pkcs12.load_key_and_certificates(
                 keystore_data, self.__password.encode(), backend=default_backend())
@@ -116,9 +156,17 @@ class JKSConverter:
             raise TypeError("Unsupported private key type.")
 
     def convert_jks_to_pem(self, alias):
+        cache_key = (*self.__cache_key, alias)
+        with JKSConverter._cache_lock:
+            pems = JKSConverter._pems.get(cache_key)
+        if pems is not None:
+            return pems
         try:
             private_key, cert = self.extract_key_and_cert(alias)
-            return self.convert_to_pem(private_key, cert)
+            pems = self.convert_to_pem(private_key, cert)
+            with JKSConverter._cache_lock:
+                JKSConverter._pems[cache_key] = pems
+            return pems
 
         except Exception as e:
             self._logger.error(f"Error converting JKS to PEM: {e}")
@@ -152,13 +200,88 @@ class CryptoHandler:
 
 ###########################################################################################
 
+class SSLContextAdapter(HTTPAdapter):
+    """HTTPAdapter whose connection pools all share one pre-built SSL context."""
+
+    def __init__(self, ssl_context, **kwargs):
+        self.__ssl_context = ssl_context
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs['ssl_context'] = self.__ssl_context
+        return super().init_poolmanager(*args, **kwargs)
+
+    def proxy_manager_for(self, *args, **kwargs):
+        kwargs['ssl_context'] = self.__ssl_context
+        return super().proxy_manager_for(*args, **kwargs)
+
+    def cert_verify(self, conn, url, verify, cert):
+        # The shared context already holds the trusted CA: keep requests from setting `ca_certs` on each new
+        # connection, which urllib3 would load into that context again (certifi's bundle when verify is True)
+        super().cert_verify(conn, url, False, cert)
+        if verify and self.__ssl_context.verify_mode != ssl.CERT_NONE:
+            conn.cert_reqs = 'CERT_REQUIRED'
+
+
+class HTTPSessionFactory:
+    """
+    Process-wide keep-alive `requests.Session`s for HTTP based drivers (Presto/Trino), one per
+    (certificate, verify, pool size), so statement submission and result polling reuse connections
+    and the certificate is loaded into an SSL context only once.
+    """
+    _sessions = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get(cls, cert_path: str = None, verify: bool = False, pool_size: int = 10):
+        key = (cert_path, verify, pool_size)
+        with cls._lock:
+            if key not in cls._sessions:
+                adapter = SSLContextAdapter(
+                    cls.build_ssl_context(cert_path, verify), pool_connections=pool_size, pool_maxsize=pool_size
+                )
+                session = requests.Session()
+                session.mount('https://', adapter)
+                # Not the CA path: requests would pass it to every connection pool, the CA lives in the context
+                session.verify = bool(verify)
+                cls._sessions[key] = session
+            return cls._sessions[key]
+
+    @staticmethod
+    def build_ssl_context(cert_path: str = None, verify: bool = False):
+        if verify:
+            return ssl.create_default_context(cafile=cert_path)
+        context = ssl.create_default_context()
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+        return context
+
+    @classmethod
+    def close_all(cls):
+        with cls._lock:
+            sessions, cls._sessions = cls._sessions, {}
+        for session in sessions.values():
+            session.close()
+
+
 class QueryConfig(Model):
+    # Connect argument through which each HTTP based driver accepts a shared requests.Session
+    SESSION_CONNECT_ARGS = {'presto': 'requests_session', 'trino': 'http_session'}
+
     def __init__(self, sslrootcert: str = None, storepassword: str = None,
-                 sslmode: str = "require", logger=None):
+                 sslmode: str = "require", verify: bool = False, pool_size: int = 10, logger=None):
+        """
+        Parameters:
+            verify (optional): verify the server against the converted certificate, off by default (see the
+             hostname mismatch TODO in `build_db_connect_args`).
+            pool_size (optional): connections kept alive by the shared HTTPS session.
+        """
 
         self._sslrootcert = sslrootcert
         self._storepassword = storepassword
         self._sslmode = sslmode
+        self._verify = verify
+        self._pool_size = pool_size
         self._finalsslrootcert = None
         self._logger = logger if logger else logging.getLogger(__name__)
 
@@ -220,8 +343,15 @@ class QueryConfig(Model):
         if self._sslrootcert.endswith('.jks'):
             path = self._sslrootcert.replace('.jks', '.cert')
 
-            with open(path, 'tw') as file:
-                file.write(value)
+            # Only rewrite the PEM file when its content changed
+            try:
+                with open(path, 'tr') as file:
+                    unchanged = file.read() == value
+            except IOError:
+                unchanged = False
+            if not unchanged:
+                with open(path, 'tw') as file:
+                    file.write(value)
         else:
             path = self._sslrootcert
         return path
@@ -234,23 +364,196 @@ class QueryConfig(Model):
             #   validating hostname with the error:
             #   certificate verify failed: Hostname mismatch, certificate is not valid for 'svr-daasname-01.mtn.ci'
             #   even through the certificate is defined to allow '*.mtn.ci'
-            "requests_kwargs": {'verify': False},
+            "requests_kwargs": {'verify': self._finalsslrootcert if self._verify else False},
         }
         return args.copy()
 
+    def requests_session(self):
+        """Shared keep-alive session with an SSL context loaded once from the converted certificate."""
+        return HTTPSessionFactory.get(self._finalsslrootcert, verify=self._verify, pool_size=self._pool_size)
+
+    def build_engine_connect_args(self, delicate: str):
+        """Driver connect arguments (passed to `create_engine`, not the URL) sharing the HTTPS session."""
+        dialect = delicate.split('+')[0]
+        if dialect not in self.SESSION_CONNECT_ARGS:
+            return {}
+        return {self.SESSION_CONNECT_ARGS[dialect]: self.requests_session()}
+
+
+class KerberosTicketManager:
+    """
+    Process-wide Kerberos ticket holder, one per (principal, keytab).
+
+    `ensure` only forks `kinit` when the credential cache has no valid ticket of the manager's principal
+    (one `klist`), and a daemon thread re-acquires the ticket from the keytab every `renew_interval` seconds,
+    so it never expires under long-running connections. A ticket found valid is trusted until it expires
+    (or for `renew_interval` at most) without running `klist` again. Every KerberosConfig of the same
+    principal shares the manager.
+    """
+    _managers = {}
+    _lock = threading.Lock()
+    _cache_principal = None  # principal of the last ticket this process put in, or found in, the credential cache
+    # klist prints its times in the C locale format with MIT, without the year with Heimdal
+    _KLIST_TIME_FORMATS = ('%m/%d/%y %H:%M:%S', '%m/%d/%Y %H:%M:%S', '%Y-%m-%d %H:%M:%S', '%b %d %H:%M:%S %Y',
+                           '%b %d %H:%M:%S')
+    _EXPIRY_MARGIN = 60  # seconds before its expiry a cached ticket is no longer trusted
+
+    def __init__(self, principal: str, keytab_path: str, renew_interval: float = 3600, logger=None):
+        self._principal = principal
+        self._keytab_path = keytab_path
+        self._renew_interval = renew_interval
+        self._logger = logger if logger else logging.getLogger(__name__)
+
+        self.__valid_until = None  # time.monotonic() until which the cached ticket is trusted without klist
+        self.__lock = threading.Lock()
+        self.__stop = threading.Event()
+        self.__renewer = None
+
+    @classmethod
+    def get(cls, principal: str, keytab_path: str, renew_interval: float = 3600, logger=None):
+        with cls._lock:
+            key = (principal, os.path.abspath(keytab_path))
+            if key not in cls._managers:
+                cls._managers[key] = cls(principal, keytab_path, renew_interval=renew_interval, logger=logger)
+            return cls._managers[key]
+
+    def _run(self, command, env=None):
+        try:
+            return subprocess.run(
+                command,
+                universal_newlines=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                check=False,
+                env=env
+            )
+        except subprocess.CalledProcessError as e:
+            self._logger.error(f"Failed to run Kerberos command due terminal error: {e}")
+            raise e
+        except Exception as e:
+            self._logger.error(f"Failed to run Kerberos command due unknown error: {e}")
+            raise e
+
+    def _matches(self, principal):
+        # A principal configured without realm matches the cached one in any realm
+        if '@' in self._principal:
+            return principal == self._principal
+        return principal.split('@', 1)[0] == self._principal
+
+    @classmethod
+    def _parse_time(cls, value):
+        for fmt in cls._KLIST_TIME_FORMATS:
+            try:
+                parsed = datetime.strptime(value, fmt)
+            except ValueError:
+                continue
+            return parsed.replace(year=datetime.now().year) if '%Y' not in fmt and '%y' not in fmt else parsed
+        return None
+
+    def _ticket_state(self):
+        """(default principal, expiry of its TGT) of the credential cache from a single `klist`, None when unknown."""
+        result = self._run(['klist'], env=dict(os.environ, LC_ALL='C'))
+        if result.returncode != 0:
+            return None, None
+        principal, expires = None, None
+        for line in result.stdout.splitlines():
+            line = line.strip()
+            if line.lower().startswith('default principal:'):
+                principal = line.split(':', 1)[1].strip()
+            # Valid starting, Expires, Service principal
+            fields = re.split(r'\s{2,}', line)
+            if expires is None and len(fields) >= 3 and fields[2].startswith('krbtgt/'):
+                expires = self._parse_time(fields[1])
+        return principal, expires
+
+    def cached_principal(self):
+        """Default principal of the credential cache, None when there is no cache."""
+        return self._ticket_state()[0]
+
+    def _ticket_lifetime(self):
+        """Seconds the cached ticket of this manager's principal stays usable, None when there is no such ticket."""
+        principal, expires = self._ticket_state()
+        if principal is None or not self._matches(principal):
+            return None
+        if expires is None:
+            # Expiry not printed in a known format, let klist tell whether the ticket is still valid
+            return self._renew_interval if self._run(['klist', '-s']).returncode == 0 else None
+        lifetime = (expires - datetime.now()).total_seconds() - self._EXPIRY_MARGIN
+        return lifetime if lifetime > 0 else None
+
+    def has_valid_ticket(self):
+        """True if the credential cache holds a valid ticket, and it belongs to this manager's principal."""
+        return self._ticket_lifetime() is not None
+
+    def acquire(self):
+        command = ['kinit', '-kt', self._keytab_path, self._principal]
+        # TODO: self._keytab_path is the password to the principal, principal is the username
+        self._logger.info(f"Kerberos command: {' '.join(command)}")
+        result = self._run(command)
+        self._logger.info(f"Kerberos session acquire: Error Code - {result.returncode}")
+        if result.returncode == 0:
+            self.__valid_until = time.monotonic() + self._renew_interval
+            KerberosTicketManager._cache_principal = self._principal
+            return True
+        return False
+
+    def ensure(self):
+        """Make sure a valid ticket is cached, acquiring one only when needed, and keep it renewed."""
+        with self.__lock:
+            # Recently acquired or checked, and no other manager of the process replaced the cache since
+            fresh = self.__valid_until is not None and time.monotonic() < self.__valid_until \
+                and KerberosTicketManager._cache_principal == self._principal
+            if fresh:
+                ok = True
+            else:
+                lifetime = self._ticket_lifetime()
+                if lifetime is not None:
+                    self._logger.info(f"Reusing the cached Kerberos ticket for {self._principal}.")
+                    self.__valid_until = time.monotonic() + min(lifetime, self._renew_interval)
+                    KerberosTicketManager._cache_principal = self._principal
+                    ok = True
+                else:
+                    ok = self.acquire()
+            self.__start_renewal()
+            return ok
+
+    def __start_renewal(self):
+        if self.__renewer is None or not self.__renewer.is_alive():
+            self.__stop.clear()
+            self.__renewer = threading.Thread(
+                target=self.__renew, name=f"KerberosRenewal-{self._principal}", daemon=True
+            )
+            self.__renewer.start()
+
+    def __renew(self):
+        while not self.__stop.wait(self._renew_interval):
+            try:
+                with self.__lock:
+                    if not self.acquire():
+                        self._logger.error(f"Failed to renew the Kerberos ticket for {self._principal}.")
+            except Exception as e:
+                self._logger.error(f"Failed to renew the Kerberos ticket for {self._principal}: {e}")
+
+    def stop(self):
+        self.__stop.set()
+
 
 class KerberosConfig(Model):
     def __init__(self,
                  krb5_config: str, principal: str,
                  keytab_path: str, kerberos_service_name: str = 'hive',
-                 logger=None
+                 renew_interval: float = 3600, logger=None
                  ):
         self._krb5_config = krb5_config
         self._principal = principal
         self._keytab_path = keytab_path
         self._kerberos_service_name = kerberos_service_name
         self._logger = logger if logger else logging.getLogger(__name__)
-        self.acquire()
+        self._manager = KerberosTicketManager.get(
+            principal, keytab_path, renew_interval=renew_interval, logger=self._logger
+        )
+        self._manager.ensure()
 
     @property
     def krb5_config(self) -> str:
@@ -293,32 +596,8 @@ class KerberosConfig(Model):
         self._kerberos_service_name = value
 
     def acquire(self, ):
-        command = ['kinit', '-kt', self._keytab_path, self._principal]
-        # TODO: self._keytab_path is the password to the principal, principal is the username
-        self._logger.info(f"Kerberos command: {' '.join(command)}")
-
-        try:
-            # Run the command and capture the output
-            result = subprocess.run(
-                command,
-                universal_newlines=True,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                check=False
-            )
-
-            self._logger.info(f"Kerberos session acquire: Error Code - {result.returncode}")
-            if result.returncode == 0:
-                return True
-
-            return False
-        except subprocess.CalledProcessError as e:
-            self._logger.error(f"Failed to acquire Kerberos session due terminal error: {e}")
-            raise e
-        except Exception as e:
-            self._logger.error(f"Failed to acquire Kerberos session due unknown error: {e}")
-            raise e
+        """Force a new ticket from the keytab, regardless of the cached one."""
+        return self._manager.acquire()
 
     def build_db_connect_args(self):
         return {
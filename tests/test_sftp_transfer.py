@@ -0,0 +1,151 @@
+import os
+import tempfile
+import threading
+import unittest
+from contextlib import contextmanager
+from unittest import mock
+
+from apis.ssh import SFTPTransfer, SSHConfig
+
+
+class FakePool:
+    """Transport pool that blocks, like SSHTransportPool, once every channel slot is reserved."""
+
+    max_channels = 2
+    max_transports = 2
+
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+        self.cond = threading.Condition()
+
+    @contextmanager
+    def transport(self, config, pkey=None):
+        with self.cond:
+            while self.active >= self.max_channels * self.max_transports:
+                self.cond.wait()
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            yield mock.Mock(**{'is_active.return_value': True})
+        finally:
+            with self.cond:
+                self.active -= 1
+                self.cond.notify_all()
+
+
+class FakeFile:
+    def __init__(self, path, mode):
+        self.file = open(path, mode)
+
+    def readv(self, chunks):
+        for offset, length in chunks:
+            self.file.seek(offset)
+            yield self.file.read(length)
+
+    def set_pipelined(self, pipelined=True):
+        pass
+
+    def __getattr__(self, name):
+        return getattr(self.file, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.file.close()
+
+
+class FakeSFTP:
+    """SFTP client over the local file system."""
+
+    def __init__(self, transport):
+        self.channel = mock.Mock(closed=False, **{'get_transport.return_value': transport})
+
+    def get_channel(self):
+        return self.channel
+
+    def stat(self, path):
+        return os.stat(path)
+
+    def open(self, path, mode='r'):
+        return FakeFile(path, mode)
+
+    def truncate(self, path, size):
+        os.truncate(path, size)
+
+    def utime(self, path, times):
+        os.utime(path, times)
+
+    def posix_rename(self, source, destination):
+        os.replace(source, destination)
+
+    def close(self):
+        self.channel.closed = True
+
+
+class SFTPTransferTest(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.TemporaryDirectory()
+        self.addCleanup(self.root.cleanup)
+        self.remote = os.path.join(self.root.name, 'remote')
+        self.local = os.path.join(self.root.name, 'local')
+        os.makedirs(self.remote)
+        os.makedirs(self.local)
+        self.pool = FakePool()
+        self.executor = mock.Mock(pool=self.pool, auth_key=None, config=SSHConfig(host='sftp.test', username='u'))
+        patcher = mock.patch('paramiko.SFTPClient.from_transport', side_effect=FakeSFTP)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def transfer(self):
+        return SFTPTransfer(
+            self.executor, max_workers=8, part_size=4096, parallel_threshold=8192, block_size=1024,
+            state_dir=os.path.join(self.root.name, 'state'),
+        )
+
+    def run_bounded(self, target, timeout=10):
+        result = {}
+        thread = threading.Thread(target=lambda: result.update(value=target()), daemon=True)
+        thread.start()
+        thread.join(timeout)
+        self.assertFalse(thread.is_alive(), "The transfer did not finish, it is waiting on the transport pool.")
+        return result['value']
+
+    def test_download_many_multipart_files_does_not_exhaust_the_pool(self):
+        pairs = []
+        for index in range(8):
+            path = os.path.join(self.remote, f'file{index}.bin')
+            with open(path, 'wb') as file:
+                file.write(os.urandom(4096 * 5 + index))
+            pairs.append((path, os.path.join(self.local, f'file{index}.bin')))
+
+        results = self.run_bounded(lambda: self.transfer().download_many(pairs))
+
+        for remote_path, local_path in pairs:
+            self.assertEqual(results[remote_path], os.path.getsize(remote_path))
+            with open(remote_path, 'rb') as remote, open(local_path, 'rb') as local:
+                self.assertEqual(remote.read(), local.read())
+        self.assertLessEqual(self.pool.peak, self.pool.max_channels * self.pool.max_transports)
+        self.assertEqual(self.pool.active, 0)
+        self.assertEqual(sorted(os.listdir(self.local)), sorted(os.path.basename(p) for p in os.listdir(self.remote)))
+
+    def test_upload_many_leaves_no_progress_file_next_to_the_sources(self):
+        pairs = []
+        for index in range(4):
+            path = os.path.join(self.local, f'file{index}.bin')
+            with open(path, 'wb') as file:
+                file.write(os.urandom(4096 * 3))
+            pairs.append((path, os.path.join(self.remote, f'file{index}.bin')))
+
+        self.run_bounded(lambda: self.transfer().upload_many(pairs))
+
+        self.assertEqual(sorted(os.listdir(self.local)), [f'file{index}.bin' for index in range(4)])
+        for local_path, remote_path in pairs:
+            with open(remote_path, 'rb') as remote, open(local_path, 'rb') as local:
+                self.assertEqual(remote.read(), local.read())
+        self.assertEqual(self.pool.active, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
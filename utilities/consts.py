@@ -8,6 +8,7 @@ ASSETS_DIR = os.path.join(BASE_DIR, 'assets')
 OUTPUT_DIR = os.path.join(BASE_DIR, 'run')
 
 REMEMBER_ME_FILE_PATH = os.path.join(OUTPUT_DIR, 'user.pkl')
+OUTBOX_SPOOL_PATH = os.path.join(OUTPUT_DIR, 'outbox.sqlite')
 
 
 START_ICON_PATH = os.path.join(ASSETS_DIR, 'play_icon_16.png')
@@ -0,0 +1,362 @@
+import errno
+import fnmatch
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, List, Optional
+
+from models.utils import Model
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+_CHUNK_SIZE = 8 * 1024 * 1024
+
+
+def file_digest(path: str):
+    """Content hash of a file, xxh3 when xxhash is installed and blake2b otherwise, prefixed by its algorithm."""
+    if xxhash is not None:
+        algorithm, digest = 'xxh3', xxhash.xxh3_64()
+    else:
+        algorithm, digest = 'blake2b', hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return f'{algorithm}:{digest.hexdigest()}'
+
+
+class FileOpResult(Model):
+    def __init__(self, source, destination, operation, status, size=0, error=None, duration=0.0):
+        self.source = source
+        self.destination = destination
+        self.operation = operation
+        self.status = status  # 'copied', 'moved', 'unchanged', 'deleted', 'skipped' or 'failed'
+        self.size = size
+        self.error = error
+        self.duration = duration
+
+    @property
+    def ok(self):
+        return self.status in ('copied', 'moved')
+
+
+class DestinationIndex:
+    """
+    Record of what a sync copied into a destination directory, kept in a hidden JSON file at its root.
+
+    Entries map each relative path to the size and modification time (ns) the source file had when it was
+    copied, and optionally its content hash, so the next sync can tell the new and modified source files
+    apart without opening or stating the destination files one by one.
+    """
+
+    FILE_NAME = '.fileops-index.json'
+
+    def __init__(self, destination: str, entries: Optional[dict] = None):
+        self.__path = os.path.join(destination, self.FILE_NAME)
+        self.entries = entries if entries is not None else {}
+
+    @property
+    def path(self):
+        return self.__path
+
+    @classmethod
+    def load(cls, destination: str):
+        """Load the destination index, starting from an empty one if it is missing or unreadable."""
+        index = cls(destination)
+        try:
+            with open(index.path, encoding='utf-8') as file:
+                index.entries = json.load(file)
+        except FileNotFoundError:
+            pass
+        except (ValueError, OSError):
+            index.entries = {}
+        return index
+
+    def save(self):
+        partial = f'{self.__path}.{os.getpid()}.tmp'
+        with open(partial, 'w', encoding='utf-8') as file:
+            json.dump(self.entries, file, separators=(',', ':'))
+        os.replace(partial, self.__path)
+
+    def get(self, rel_path):
+        return self.entries.get(rel_path)
+
+    def update(self, rel_path, size, mtime, digest=None):
+        self.entries[rel_path] = {'size': size, 'mtime': mtime, 'hash': digest}
+
+    def remove(self, rel_path):
+        self.entries.pop(rel_path, None)
+
+
+class FileOperations:
+    """
+    Copies or moves the files matching a pattern from a source directory tree to a destination.
+
+    The source is scanned with `os.scandir`, then the files are transferred concurrently on a thread pool,
+    in kernel space when the platform allows it (`copy_file_range`, then `sendfile`) and through
+    user-space buffers otherwise. Each file is written under a temporary name and renamed into place
+    once complete, so readers of the destination never see partial files.
+
+    `progress`, if given, is called after every file with (files done, files total, bytes done,
+    bytes total, FileOpResult).
+
+    `sync` copies only the files that are new or modified since the previous sync into the destination,
+    based on its `DestinationIndex`.
+    """
+
+    OPERATIONS = ('copy', 'move')
+
+    def __init__(self, operation: str = 'copy', override: bool = False, skip_dir: bool = True,
+                 max_workers: int = 8, progress: Optional[Callable] = None, logger=None):
+        if operation not in self.OPERATIONS:
+            raise ValueError(f"Invalid operation: {operation}")
+        self.__operation = operation
+        self.__override = override
+        self.__skip_dir = skip_dir
+        self.__max_workers = max_workers
+        self.__progress = progress
+        self._logger = logger if logger else logging.getLogger(__name__)
+
+    @property
+    def operation(self):
+        return self.__operation
+
+    def scan(self, source: str, pattern: str = '*'):
+        """
+        List the files under `source` whose name matches `pattern`, descending into sub-directories
+        unless `skip_dir`. Like `glob`, hidden entries only match a pattern starting with a dot.
+
+        Returns:
+            list: (path, path relative to source, size, modification time in ns) tuples.
+        """
+        found = []
+        for entry, rel_path in self.__walk(source, pattern):
+            stat = entry.stat()
+            found.append((entry.path, rel_path, stat.st_size, stat.st_mtime_ns))
+        return found
+
+    def __walk(self, root, pattern):
+        """Yield (DirEntry, relative path) of the matching files; file types come from scandir, nothing is stat'ed."""
+        match_hidden = pattern.startswith('.')
+        pending = [(root, '')]
+        while pending:
+            directory, relative = pending.pop()
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.name.startswith('.') and not match_hidden:
+                        continue
+                    if entry.name.startswith(DestinationIndex.FILE_NAME):
+                        continue  # the sync index (and its temporary file) is never a data file
+                    rel_path = os.path.join(relative, entry.name)
+                    if entry.is_dir(follow_symlinks=False):
+                        if not self.__skip_dir:
+                            pending.append((entry.path, rel_path))
+                    elif fnmatch.fnmatch(entry.name, pattern) and entry.is_file():
+                        yield entry, rel_path
+
+    @staticmethod
+    def copy_file(source: str, destination: str):
+        """Copy the content of `source` into `destination` and return the number of bytes copied."""
+        with open(source, 'rb') as src, open(destination, 'wb') as dst:
+            size = os.fstat(src.fileno()).st_size
+            copied = 0
+            for zero_copy in (getattr(os, 'copy_file_range', None), getattr(os, 'sendfile', None)):
+                if zero_copy is None:
+                    continue
+                try:
+                    os.lseek(dst.fileno(), copied, os.SEEK_SET)
+                    while copied < size:
+                        if zero_copy is os.sendfile:
+                            sent = os.sendfile(dst.fileno(), src.fileno(), copied, min(_CHUNK_SIZE, size - copied))
+                        else:
+                            sent = os.copy_file_range(src.fileno(), dst.fileno(), min(_CHUNK_SIZE, size - copied),
+                                                      copied, copied)
+                        if sent == 0:
+                            break
+                        copied += sent
+                    if copied >= size:
+                        return copied
+                except OSError as e:
+                    if e.errno not in (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.EBADF):
+                        raise
+                # Not supported between these file systems, finish from where the zero-copy call stopped
+            src.seek(copied)
+            dst.seek(copied)
+            shutil.copyfileobj(src, dst, _CHUNK_SIZE)
+            return dst.tell()
+
+    def __transfer(self, source, destination, size, override):
+        start = time.perf_counter()
+        try:
+            if not override and os.path.exists(destination):
+                raise FileExistsError(f'The file {destination} already exists in the destination path.')
+
+            if self.__operation == 'move':
+                try:
+                    os.replace(source, destination)
+                    return FileOpResult(source, destination, 'move', 'moved', size,
+                                        duration=time.perf_counter() - start)
+                except OSError as e:
+                    if e.errno != errno.EXDEV:
+                        raise
+                    # Different file systems: copy then remove the source below
+
+            partial = f'{destination}.{os.getpid()}.{threading.get_ident()}.part'
+            try:
+                copied = self.copy_file(source, partial)
+                os.replace(partial, destination)
+            finally:
+                if os.path.exists(partial):
+                    os.remove(partial)
+            if self.__operation == 'move':
+                os.remove(source)
+            status = 'moved' if self.__operation == 'move' else 'copied'
+            return FileOpResult(source, destination, self.__operation, status, copied,
+                                duration=time.perf_counter() - start)
+        except FileExistsError as e:
+            return FileOpResult(source, destination, self.__operation, 'skipped', size, error=str(e),
+                                duration=time.perf_counter() - start)
+        except Exception as e:
+            self._logger.error(f"Error during {self.__operation} from {source} to {destination}: {e}")
+            return FileOpResult(source, destination, self.__operation, 'failed', size, error=str(e),
+                                duration=time.perf_counter() - start)
+
+    def run(self, source: str, destination: str, pattern: str = '*',
+            files: Optional[list] = None) -> List[FileOpResult]:
+        """
+        Copy or move the matching files of `source` to the same relative paths under `destination`.
+
+        Parameters:
+            files (list): tuples as returned by `scan` to transfer instead of scanning `source`.
+
+        Returns:
+            list: one FileOpResult per file, in completion order.
+        """
+        self.__check_paths(source, destination)
+        files = self.scan(source, pattern) if files is None else files
+        return self.__execute(source, destination, files, self.__override)
+
+    @staticmethod
+    def __check_paths(source, destination):
+        if source is None:
+            raise ValueError('Please specify source path, Current source is None.')
+        if destination is None:
+            raise ValueError('Please specify destination path, Current destination is None.')
+
+    def __execute(self, source, destination, files, override):
+        start = time.perf_counter()
+        total_files, total_bytes = len(files), sum(file[2] for file in files)
+        self._logger.info(f"Starting {self.__operation} of {total_files} file(s), {total_bytes} bytes, "
+                          f"from {source} to {destination}.")
+
+        # Create every destination directory up front, once, rather than from the workers
+        directories = {destination} | {os.path.join(destination, os.path.dirname(file[1])) for file in files}
+        for directory in sorted(directories):
+            os.makedirs(directory, exist_ok=True)
+
+        results = []
+        done_bytes = 0
+        with ThreadPoolExecutor(max_workers=self.__max_workers, thread_name_prefix='fileops') as executor:
+            futures = [
+                executor.submit(self.__transfer, path, os.path.join(destination, rel), size, override)
+                for path, rel, size, *_ in files
+            ]
+            for future in as_completed(futures):
+                result = future.result()
+                results.append(result)
+                done_bytes += result.size
+                if self.__progress:
+                    self.__progress(len(results), total_files, done_bytes, total_bytes, result)
+
+        failed = sum(1 for result in results if result.status == 'failed')
+        skipped = sum(1 for result in results if result.status == 'skipped')
+        self._logger.info(f"Finished {self.__operation} of {total_files - failed - skipped} file(s) to {destination} "
+                          f"in {time.perf_counter() - start:.2f}s, {skipped} skipped, {failed} failed.")
+        return results
+
+    def sync(self, source: str, destination: str, pattern: str = '*', delete: bool = False,
+             checksum: bool = False) -> List[FileOpResult]:
+        """
+        Copy only the files of `source` that are missing from `destination` or changed since the last sync.
+
+        The source scan is compared in bulk against the destination index only, without stating the
+        destination files: a file is copied when it is not indexed or its size or modification time differs
+        from the indexed one. Destination files changed or removed by anything else than the sync are
+        therefore not detected; delete the index to force a full copy. With `checksum`, the content hash is
+        stored too, and a file whose modification time changed but whose content did not is not copied
+        again.
+
+        Parameters:
+            delete (bool): remove the destination files matching `pattern` that are no longer in `source`
+             (the destination is then listed, still without stating its files).
+            checksum (bool): compare content hashes (xxhash if installed, hashlib otherwise).
+
+        Returns:
+            list: one FileOpResult per source file, plus one per deleted destination file.
+        """
+        if self.__operation != 'copy':
+            raise ValueError("Sync is only supported with the 'copy' operation.")
+        self.__check_paths(source, destination)
+        os.makedirs(destination, exist_ok=True)
+
+        index = DestinationIndex.load(destination)
+        files = self.scan(source, pattern)
+
+        changed, results = [], []
+        for path, rel, size, mtime in files:
+            entry = index.get(rel)
+            if entry is None or entry['size'] != size:
+                changed.append((path, rel, size, mtime))
+            elif entry['mtime'] != mtime:
+                # Same size but touched: only the content hash, when kept, can spare the copy
+                if checksum and entry.get('hash') and entry['hash'] == file_digest(path):
+                    index.update(rel, size, mtime, entry['hash'])
+                    results.append(FileOpResult(path, os.path.join(destination, rel), 'copy', 'unchanged', size))
+                else:
+                    changed.append((path, rel, size, mtime))
+            else:
+                results.append(FileOpResult(path, os.path.join(destination, rel), 'copy', 'unchanged', size))
+
+        self._logger.info(f"Sync of {source} to {destination}: {len(changed)} new or modified file(s), "
+                          f"{len(results)} unchanged.")
+        metadata = {rel: (size, mtime) for _, rel, size, mtime in changed}
+        try:
+            for result in self.__execute(source, destination, changed, override=True):
+                rel = os.path.relpath(result.destination, destination)
+                if result.ok:
+                    size, mtime = metadata[rel]
+                    index.update(rel, size, mtime, file_digest(result.destination) if checksum else None)
+                else:
+                    index.remove(rel)
+                results.append(result)
+
+            if delete:
+                sourced = {rel for _, rel, _, _ in files}
+                existing = {rel for _, rel in self.__walk(destination, pattern)}
+                for rel in sorted(existing - sourced):
+                    path = os.path.join(destination, rel)
+                    try:
+                        os.remove(path)
+                        index.remove(rel)
+                        results.append(FileOpResult(None, path, 'delete', 'deleted'))
+                    except OSError as e:
+                        self._logger.error(f"Error deleting extraneous file {path}: {e}")
+                        results.append(FileOpResult(None, path, 'delete', 'failed', error=str(e)))
+                # Forget the indexed files gone from the source, within the scope of this sync only
+                for rel in set(index.entries) - sourced:
+                    if fnmatch.fnmatch(os.path.basename(rel), pattern) and (not self.__skip_dir or os.sep not in rel):
+                        index.remove(rel)
+        finally:
+            index.save()
+        return results
+
+
+if __name__ == "__main__":
+    pass
@@ -1,8 +1,371 @@
+import atexit
+import contextvars
+import gzip
+import json
 import logging
 import os
+import queue
 import re
+import shutil
+import sys
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime
-from logging.handlers import RotatingFileHandler, TimedRotatingFileHandler
+from logging.handlers import RotatingFileHandler, TimedRotatingFileHandler, QueueHandler, QueueListener
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Attributes every LogRecord carries; anything else on a record came in through `extra`
+_RECORD_ATTRIBUTES = frozenset(logging.LogRecord('', logging.NOTSET, '', 0, '', (), None).__dict__) | {
+    'message', 'asctime', 'taskName'
+}
+
+
+_COMPRESSION_EXTENSIONS = {'gzip': '.gz', 'zstd': '.zst'}
+
+_process_stamp = (None, None)  # (pid, stamp) shared by every log file this process opens
+
+
+def process_stamp():
+    """Timestamp taken once per process (and again in a forked child) to name its log files."""
+    global _process_stamp
+    pid, stamp = _process_stamp
+    if pid != os.getpid():
+        _process_stamp = pid, stamp = os.getpid(), f'{datetime.now():%Y%m%d_%H%M%S%f}'
+    return stamp
+
+
+class JSONFormatter(logging.Formatter):
+    """
+    Formats each record as one JSON object per line.
+
+    Besides the timestamp, level, logger, source location and message, every attribute passed through
+    `extra` (e.g. the context bound with `MultipurposeLogger.bind`) is written as a top-level field,
+    which lets the log files be loaded as-is into a dataframe.
+    """
+
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created).astimezone().isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'module': record.module,
+            'function': record.funcName,
+            'line': record.lineno,
+            'thread': record.threadName,
+            'message': record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        if record.stack_info:
+            entry['stack'] = self.formatStack(record.stack_info)
+        return self.dumps(entry)
+
+    @staticmethod
+    def dumps(entry):
+        if orjson is not None:
+            return orjson.dumps(entry, default=str).decode('utf-8')
+        return json.dumps(entry, default=str, ensure_ascii=False, separators=(',', ':'))
+
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    QueueHandler over a bounded queue that leaves all formatting to the listener thread.
+
+    When the queue is full, the 'block' policy waits for room while 'drop' discards the record and
+    counts it in `dropped`.
+    """
+
+    def __init__(self, log_queue: queue.Queue, policy: str = 'block'):
+        if policy not in ('block', 'drop'):
+            raise ValueError("Queue policy must be either 'block' or 'drop'.")
+        super().__init__(log_queue)
+        self.policy = policy
+        self.dropped = 0
+
+    def prepare(self, record):
+        # The record never leaves the process, so formatting is deferred to the listener thread
+        return record
+
+    def enqueue(self, record):
+        if self.policy == 'block':
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class BlockingQueueListener(QueueListener):
+    """QueueListener that waits for room in a bounded queue to post its stop sentinel, and can be stopped twice."""
+
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+    @property
+    def running(self):
+        return self._thread is not None
+
+    def stop(self):
+        if self.running:
+            super().stop()
+
+
+class LogMaintenance:
+    """
+    Single background thread running the log compression and retention jobs, so a rollover never makes
+    the logging thread wait on them.
+    """
+
+    _default = None
+    _default_lock = threading.Lock()
+
+    def __init__(self):
+        self.__jobs = queue.Queue()
+        self.__thread = threading.Thread(target=self.__run, name='log-maintenance', daemon=True)
+        self.__thread.start()
+
+    @classmethod
+    def default(cls):
+        with cls._default_lock:
+            if cls._default is None:
+                cls._default = cls()
+                atexit.register(cls._default.flush)
+            return cls._default
+
+    def submit(self, fn, *args):
+        self.__jobs.put((fn, args))
+
+    def flush(self):
+        """Wait until every submitted job is done."""
+        self.__jobs.join()
+
+    def __run(self):
+        while True:
+            fn, args = self.__jobs.get()
+            try:
+                fn(*args)
+            except Exception as e:
+                print(f"Log maintenance job {getattr(fn, '__name__', fn)} failed: {e}", file=sys.stderr)
+            finally:
+                self.__jobs.task_done()
+
+
+def compress_log_file(source: str, dest: str, compression: str):
+    """Compress `source` into `dest` with 'gzip' or 'zstd' and remove it; `dest` only appears once complete."""
+    partial = f'{dest}.tmp'
+    try:
+        with open(source, 'rb') as src, open(partial, 'wb') as raw:
+            if compression == 'zstd':
+                zstandard.ZstdCompressor(level=3).copy_stream(src, raw)
+            else:
+                with gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=6) as dst:
+                    shutil.copyfileobj(src, dst, 1024 * 1024)
+    except FileNotFoundError:
+        # Already removed, e.g. by the retention of another logger process
+        if os.path.exists(partial):
+            os.remove(partial)
+        return
+    shutil.copystat(source, partial)
+    os.replace(partial, dest)
+    os.remove(source)
+
+
+class LogRetention:
+    """
+    Retention across every log file of a logger name in a directory, whichever process or rotation wrote
+    them: the oldest files are removed until there are at most `max_files` besides the ones being written,
+    they take at most `max_bytes` and none is older than `max_age` seconds. Limits left to None are not
+    enforced.
+    """
+
+    def __init__(self, directory: str, name: str, max_files: int = None, max_bytes: int = None,
+                 max_age: float = None):
+        self.directory = directory
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.__pattern = re.compile(rf'^{re.escape(name)}_\d{{8}}_\d{{12}}\.log')
+
+    def files(self):
+        """(path, size, mtime) of the logger's files, oldest first."""
+        found = []
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if self.__pattern.match(entry.name) and not entry.name.endswith('.tmp') and entry.is_file():
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    found.append((entry.path, stat.st_size, stat.st_mtime))
+        return sorted(found, key=lambda item: item[2])
+
+    def enforce(self, keep=()):
+        """
+        Remove the files over the limits. The files in `keep` (the ones being written) are neither removed
+        nor counted against the limits.
+
+        Returns:
+            list: the removed paths.
+        """
+        keep = {os.path.abspath(path) for path in keep}
+        files = [item for item in self.files() if os.path.abspath(item[0]) not in keep]
+        count = len(files)
+        total = sum(size for _, size, _ in files)
+        oldest_allowed = time.time() - self.max_age if self.max_age else None
+
+        removed = []
+        for path, size, mtime in files:
+            over = (
+                (self.max_files is not None and count > self.max_files)
+                or (self.max_bytes is not None and total > self.max_bytes)
+                or (oldest_allowed is not None and mtime < oldest_allowed)
+            )
+            if not over:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            count -= 1
+            total -= size
+            removed.append(path)
+        return removed
+
+
+class CompressingRotator:
+    """
+    `rotator`/`namer` pair for the rotating file handlers: the rotated file is renamed synchronously, then
+    compressed and the retention enforced on the `LogMaintenance` thread.
+    """
+
+    def __init__(self, compression: str = 'auto', retention: LogRetention = None):
+        if compression == 'auto':
+            compression = 'zstd' if zstandard is not None else 'gzip'
+        elif compression == 'zstd' and zstandard is None:
+            compression = 'gzip'
+        if compression not in (None, 'gzip', 'zstd'):
+            raise ValueError("Log compression must be one of 'auto', 'gzip', 'zstd' or None.")
+        self.compression = compression
+        self.retention = retention
+        self.__extension = _COMPRESSION_EXTENSIONS.get(compression, '')
+
+    def namer(self, name):
+        return name + self.__extension
+
+    def __call__(self, source, dest):
+        pending = dest[:-len(self.__extension)] if self.__extension else dest
+        os.rename(source, pending)
+        LogMaintenance.default().submit(self.__finish, pending, dest, source)
+
+    def __finish(self, pending, dest, active):
+        if self.compression:
+            compress_log_file(pending, dest, self.compression)
+        if self.retention:
+            self.retention.enforce(keep=(active,))
+
+
+class _WatchedStreamMixin:
+    """
+    Reopens the log file in place when it was deleted or replaced (e.g. by logrotate) behind the handler's back.
+
+    Like `logging.handlers.WatchedFileHandler`, the file is considered gone when its device/inode no longer
+    match the open stream, but the stat is only made every `check_every` records or `check_interval`
+    seconds, whichever comes first, instead of on every record.
+    """
+
+    def _init_watch(self, check_every: int, check_interval: float):
+        self.check_every = check_every
+        self.check_interval = check_interval
+        self.reopened = 0
+        self._pending = 0
+        self._checked_at = time.monotonic()
+        if not hasattr(self, '_dev'):
+            self._dev, self._ino = -1, -1
+
+    def _open(self):
+        stream = super()._open()
+        stat = os.fstat(stream.fileno())
+        self._dev, self._ino = stat.st_dev, stat.st_ino
+        return stream
+
+    def reopen_if_needed(self, force: bool = False):
+        """
+        Reopen the stream if the file on disk is no longer the one being written.
+
+        Returns:
+            bool: True if the stream was reopened.
+        """
+        with self.lock:  # re-entrant, emit() already holds it
+            self._pending += 1
+            now = time.monotonic()
+            if not force and self._pending < self.check_every and now - self._checked_at < self.check_interval:
+                return False
+            self._pending = 0
+            self._checked_at = now
+            if self.stream is None:
+                return False
+
+            try:
+                stat = os.stat(self.baseFilename)
+                if stat.st_dev == self._dev and stat.st_ino == self._ino:
+                    return False
+            except FileNotFoundError:
+                pass
+
+            self.stream.flush()
+            self.stream.close()
+            self.stream = None
+            os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+            self.stream = self._open()
+            self.reopened += 1
+            return True
+
+    def emit(self, record):
+        try:
+            self.reopen_if_needed()
+        except OSError:
+            self.handleError(record)
+            return
+        super().emit(record)
+
+
+class WatchedRotatingFileHandler(_WatchedStreamMixin, RotatingFileHandler):
+    def __init__(self, filename, check_every: int = 100, check_interval: float = 1.0, **kwargs):
+        super().__init__(filename, **kwargs)
+        self._init_watch(check_every, check_interval)
+
+    def doRollover(self):
+        # Rotated files are named after the rollover time rather than shifted through `.1`..`.N`,
+        # which costs up to backupCount renames per rollover; retention is left to LogRetention.
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+        stem = self.baseFilename[:-len('.log')] if self.baseFilename.endswith('.log') else self.baseFilename
+        dest = self.rotation_filename(f'{stem}.log.{datetime.now():%Y%m%d_%H%M%S%f}')
+        if os.path.exists(self.baseFilename):
+            self.rotate(self.baseFilename, dest)
+        if not self.delay:
+            self.stream = self._open()
+
+
+class WatchedTimedRotatingFileHandler(_WatchedStreamMixin, TimedRotatingFileHandler):
+    def __init__(self, filename, check_every: int = 100, check_interval: float = 1.0, **kwargs):
+        super().__init__(filename, **kwargs)
+        self._init_watch(check_every, check_interval)
 
 
 class MultipurposeLogger(logging.Logger):
@@ -13,8 +376,30 @@ class MultipurposeLogger(logging.Logger):
     # Pre-compile the regex pattern
     _valid_name_pattern = re.compile("^[A-Za-z0-9_.-]+$")
 
-    def __init__(self, name: str, path: str = 'logs', level: int = None, create=False):
+    # Every logger of a process with the same name and path writes through a single file handler
+    _file_handlers = {}  # log file -> [handler, number of loggers using it]
+    _file_handlers_lock = threading.Lock()
+
+    def __init__(self, name: str, path: str = 'logs', level: int = None, create=False, async_mode: bool = False,
+                 queue_size: int = 10000, queue_policy: str = 'block', console: bool = True, fmt: str = 'text',
+                 context: dict = None):
+        """
+        Messages are either strings, optionally with `%`-style arguments merged only when the record is
+        emitted, or callables returning the message, called only when the level is enabled.
+
+        Parameters:
+            console (bool): echo records to stdout through a stream handler.
+            fmt (str): log file format, 'text' for the plain layout or 'json' for one JSON object per line.
+            context (dict): fields bound to every record from every thread from the start, see `bind_global`.
+            async_mode (bool): only enqueue records in the calling thread, a background listener thread
+             formats them and handles the file writes and console output.
+            queue_size (int): maximum number of records waiting for the listener in async mode.
+            queue_policy (str): 'block' to wait for room when the queue is full, 'drop' to discard the record.
+        """
+        if fmt not in ('text', 'json'):
+            raise ValueError("Log format must be either 'text' or 'json'.")
         self.__name = self.__set_name(name)
+        self.__fmt = fmt
 
         self.__level = level if level else logging.NOTSET
         super().__init__(self.__name, self.__level)
@@ -22,7 +407,24 @@ class MultipurposeLogger(logging.Logger):
         self.__path = self.__set_path(path, create=create)
 
         self.__log_file = None
-        self.__extra_info = None
+        self.__file_handler = None
+        # Fields bound for the whole process, and per thread / asyncio task on top of them
+        self.__global_context = self.__check_context(context or {})
+        self.__context = contextvars.ContextVar(f'{self.__name}-log-context-{id(self)}', default={})
+
+        self.__queue_handler = None
+        self.__listener = None
+        if async_mode:
+            self.__queue_handler = BoundedQueueHandler(queue.Queue(maxsize=queue_size), policy=queue_policy)
+            self.__listener = BlockingQueueListener(self.__queue_handler.queue, respect_handler_level=True)
+            self.addHandler(self.__queue_handler)
+            self.__listener.start()
+            atexit.register(self.stop)
+
+        if console:
+            console_handler = logging.StreamHandler(sys.stdout)
+            console_handler.setFormatter(logging.Formatter('%(message)s'))
+            self.__add_handler(console_handler)
 
         self.initialize_logger_handler()
 
@@ -32,6 +434,97 @@ class MultipurposeLogger(logging.Logger):
     def get_log_file(self):
         return self.__log_file
 
+    @property
+    def fmt(self):
+        return self.__fmt
+
+    @property
+    def context(self):
+        """Fields attached to the records logged from the current thread or task."""
+        return {**self.__global_context, **self.__context.get()}
+
+    @staticmethod
+    def __check_context(context):
+        reserved = sorted(key for key in context if key in _RECORD_ATTRIBUTES)
+        if reserved:
+            raise ValueError(f"Context fields cannot use the reserved LogRecord attribute(s): {reserved}")
+        return dict(context)
+
+    def bind_global(self, **context):
+        """Attach fields (e.g. the run id) to every following record, from every thread."""
+        self.__global_context = {**self.__global_context, **self.__check_context(context)}
+        return self
+
+    def bind(self, **context):
+        """
+        Attach fields (feed, partition, connection name...) to the following records of the current thread or
+        asyncio task only, so parallel workers each tag their own records. New threads start without them,
+        tasks inherit the fields of the code creating them.
+        Fields passed per call through `xtra` take precedence over the bound ones.
+        """
+        self.__context.set({**self.__context.get(), **self.__check_context(context)})
+        return self
+
+    def unbind(self, *keys):
+        """Remove fields bound with `bind` in the current thread or task, or with `bind_global`."""
+        self.__context.set({key: value for key, value in self.__context.get().items() if key not in keys})
+        if any(key in self.__global_context for key in keys):
+            self.__global_context = {
+                key: value for key, value in self.__global_context.items() if key not in keys
+            }
+        return self
+
+    @contextmanager
+    def bound(self, **context):
+        """Bind the fields in the current thread or task for the duration of the block only."""
+        token = self.__context.set({**self.__context.get(), **self.__check_context(context)})
+        try:
+            yield self
+        finally:
+            self.__context.reset(token)
+
+    @property
+    def is_async(self):
+        return self.__listener is not None
+
+    @property
+    def dropped_records(self):
+        return self.__queue_handler.dropped if self.__queue_handler else 0
+
+    def __add_handler(self, handler):
+        if self.__listener is not None:
+            self.__listener.handlers = self.__listener.handlers + (handler,)
+        else:
+            self.addHandler(handler)
+
+    def __remove_handler(self, handler, close: bool = True):
+        if self.__listener is not None:
+            self.__listener.handlers = tuple(h for h in self.__listener.handlers if h is not handler)
+        else:
+            self.removeHandler(handler)
+        if close:
+            handler.close()
+
+    def __release_file_handler(self):
+        """Detach the file handler, closing it once no other logger of the process shares it."""
+        if self.__file_handler is None:
+            return
+        handler, self.__file_handler = self.__file_handler, None
+        with MultipurposeLogger._file_handlers_lock:
+            entry = MultipurposeLogger._file_handlers.get(handler.baseFilename)
+            last = entry is None or entry[1] <= 1
+            if entry is not None and entry[0] is handler:
+                if last:
+                    del MultipurposeLogger._file_handlers[handler.baseFilename]
+                else:
+                    entry[1] -= 1
+        self.__remove_handler(handler, close=last)
+
+    def stop(self):
+        """Flush every queued record and stop the listener thread (async mode only)."""
+        if self.__listener is not None:
+            self.__listener.stop()
+
     def __set_name(self, name):
         """
         Set the logger's name with validation.
@@ -73,87 +566,139 @@ class MultipurposeLogger(logging.Logger):
             print(f"An unexpected error occurred while setting the path '{path}': {e}")
             raise
 
-    def check_and_reinitialize_log_file(self):
+    def check_and_reinitialize_log_file(self, force: bool = False):
         """
-        Check if the log file exists, and reinitialize if it does not.
-        Mainly, This methods aim to solve the problem where the log file is removed during the runtime.
+        Check if the log file was removed or replaced during the runtime, and reopen it in place if so.
+
+        The file handler already runs this check itself every few records or seconds, so calling it is only
+        needed to recover a file ahead of the next write; without `force`, it is rate-limited the same way.
         """
-        log_file_exists = os.path.exists(self.__log_file)
-        if not log_file_exists:
-            print("Log file was missing... Reinitializing log file and file handler.")
-            self.warning("Log file was missing... Reinitializing log file and file handler.")
-            self.initialize_logger_handler()
+        if self.__file_handler is None:
+            return
+        if self.__file_handler.reopen_if_needed(force=force):
+            self.warning("Log file was missing... Reopened log file %s.", self.__log_file)
 
     def initialize_logger_handler(self, log_level: int = logging.NOTSET, max_bytes: int = 10485760,
-                                  backup_count: int = 1000, rotate_time: str = None):
+                                  backup_count: int = 100, rotate_time: str = None, check_every: int = 100,
+                                  check_interval: float = 1.0, compression: str = 'auto',
+                                  max_total_bytes: int = None, max_age_days: float = None):
         """
-        Initialize the logger with specific settings.
+        Initialize the logger with specific settings, replacing the file handler set up by a previous call.
+
+        All the loggers of a process with the same name and path write to a single log file named after the
+        process start, through one shared handler; a logger joining an existing file keeps its settings.
 
         Parameters:
             log_level (int): the logging level for the file handler
             max_bytes (int): Maximum size in bytes for RotatingFileHandler. 10 MB by default.
-            backup_count (int): Number of retention files to keep. 1000 file by default.
+            backup_count (int): Number of rotated files to keep for the logger name, across processes.
+             100 files by default.
             rotate_time (str): Rotation interval for TimedRotatingFileHandler (e.g., 'midnight', 'W0', 'D').
+            check_every (int): number of records between two checks that the log file is still in place.
+            check_interval (float): maximum number of seconds between two such checks.
+            compression (str): compression of the rotated files, 'gzip', 'zstd' (gzip when zstandard is not
+             installed), 'auto' for the best available, or None to keep them as is.
+            max_total_bytes (int): maximum total size of the logger's files, unlimited by default.
+            max_age_days (float): age after which the logger's files are removed, unlimited by default.
 
         Raises:
             IOError: For issues related to file handling during logger setup.
         """
         try:
-            formatter = logging.Formatter(
-                '[%(asctime)s] || %(levelname)s :- %(message)s'
-            )
-            self.__log_file = os.path.join(self.__path, f'{self.__name}_{datetime.now():%Y%m%d_%H%M%S%f}.log')
-            if rotate_time:
-                file_handler = TimedRotatingFileHandler(
-                    filename=self.__log_file,
-                    when=rotate_time,
-                    backupCount=backup_count,
-                    encoding='utf-8',  # Optional: Specify encoding if needed
-                )
-                file_handler.suffix = "%Y%m%d_%H%M%S%f.log"
+            if self.__fmt == 'json':
+                formatter = JSONFormatter()
             else:
-                file_handler = RotatingFileHandler(
-                    filename=self.__log_file,
-                    maxBytes=max_bytes,
-                    backupCount=backup_count,
-                    encoding='utf-8',
+                formatter = logging.Formatter(
+                    '[%(asctime)s] || %(levelname)s :- %(message)s'
                 )
-
+            self.__release_file_handler()
+            self.__log_file = os.path.abspath(os.path.join(self.__path, f'{self.__name}_{process_stamp()}.log'))
             print(f"Log File: {self.__log_file}")
-            if self.__level == logging.NOTSET and log_level is not None:
-                file_handler.setLevel(log_level)
-                self.setLevel(log_level)
-            else:
-                file_handler.setLevel(self.__level)
-                self.setLevel(self.__level)
+            level = log_level if self.__level == logging.NOTSET and log_level is not None else self.__level
+            self.setLevel(level)
+
+            with MultipurposeLogger._file_handlers_lock:
+                entry = MultipurposeLogger._file_handlers.get(self.__log_file)
+                if entry is not None:
+                    entry[1] += 1
+                    self.__file_handler = entry[0]
+                    self.__add_handler(self.__file_handler)
+                    return
+
+                retention = LogRetention(
+                    directory=self.__path,
+                    name=self.__name,
+                    max_files=backup_count,
+                    max_bytes=max_total_bytes,
+                    max_age=max_age_days * 86400 if max_age_days else None,
+                )
+                rotator = CompressingRotator(compression=compression, retention=retention)
+                if rotate_time:
+                    file_handler = WatchedTimedRotatingFileHandler(
+                        filename=self.__log_file,
+                        check_every=check_every,
+                        check_interval=check_interval,
+                        when=rotate_time,
+                        backupCount=0,  # deletion is handled by LogRetention
+                        encoding='utf-8',  # Optional: Specify encoding if needed
+                    )
+                    file_handler.suffix = "%Y%m%d_%H%M%S%f.log"
+                else:
+                    file_handler = WatchedRotatingFileHandler(
+                        filename=self.__log_file,
+                        check_every=check_every,
+                        check_interval=check_interval,
+                        maxBytes=max_bytes,
+                        backupCount=backup_count,
+                        encoding='utf-8',
+                    )
+                file_handler.rotator = rotator
+                file_handler.namer = rotator.namer
+                file_handler.setLevel(level)
+                file_handler.setFormatter(formatter)
+                MultipurposeLogger._file_handlers[self.__log_file] = [file_handler, 1]
 
-            file_handler.setFormatter(formatter)
-            self.addHandler(file_handler)
+            self.__add_handler(file_handler)
+            self.__file_handler = file_handler
+            LogMaintenance.default().submit(retention.enforce, (self.__log_file,))
         except IOError as e:
             raise IOError(f"Error initializing file handler for logger: {e}")
         except Exception as e:
             print(f"An unexpected error occurred while initializing file handler for logger: {e}")
             raise
 
-    def info(self, msg, xtra=None, *args, **kwargs):
-        extra_info = xtra if xtra is not None else self.__extra_info
-        super().info(msg, *args, extra=extra_info, **kwargs)
-        print(msg)
-
-    def debug(self, msg, xtra=None, *args, **kwargs):
-        extra_info = xtra if xtra is not None else self.__extra_info
-        super().debug(msg, *args, extra=extra_info, **kwargs)
-        print(msg)
-
-    def warning(self, msg, xtra=None, *args, **kwargs):
-        extra_info = xtra if xtra is not None else self.__extra_info
-        super().warning(msg, *args, extra=extra_info, **kwargs)
-        print(msg)
-
-    def error(self, msg, xtra=None, *args, **kwargs):
-        extra_info = xtra if xtra is not None else self.__extra_info
-        super().error(msg, *args, extra=extra_info, **kwargs)
-        print(msg)
+    def __log(self, level, msg, args, xtra, kwargs):
+        # Nothing below runs unless the level is enabled: callables are only called and %-style
+        # arguments only merged once a handler formats the record.
+        if callable(msg):
+            msg = msg()
+        extra_info = {**self.__global_context, **self.__context.get(), **(xtra or {})}
+        kwargs.setdefault('stacklevel', 3)  # report the caller, not these wrappers
+        self._log(level, msg, args, extra=extra_info, **kwargs)
+
+    def info(self, msg, *args, xtra=None, **kwargs):
+        if self.isEnabledFor(logging.INFO):
+            self.__log(logging.INFO, msg, args, xtra, kwargs)
+
+    def debug(self, msg, *args, xtra=None, **kwargs):
+        if self.isEnabledFor(logging.DEBUG):
+            self.__log(logging.DEBUG, msg, args, xtra, kwargs)
+
+    def warning(self, msg, *args, xtra=None, **kwargs):
+        if self.isEnabledFor(logging.WARNING):
+            self.__log(logging.WARNING, msg, args, xtra, kwargs)
+
+    def error(self, msg, *args, xtra=None, **kwargs):
+        if self.isEnabledFor(logging.ERROR):
+            self.__log(logging.ERROR, msg, args, xtra, kwargs)
+
+    def exception(self, msg, *args, xtra=None, exc_info=True, **kwargs):
+        if self.isEnabledFor(logging.ERROR):
+            self.__log(logging.ERROR, msg, args, xtra, {**kwargs, 'exc_info': exc_info})
+
+    def critical(self, msg, *args, xtra=None, **kwargs):
+        if self.isEnabledFor(logging.CRITICAL):
+            self.__log(logging.CRITICAL, msg, args, xtra, kwargs)
 
 
 if __name__ == "__main__":
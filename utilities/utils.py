@@ -1,15 +1,20 @@
+import asyncio
+import codecs
 import functools
-import glob
 import json, os
 import logging
 import pickle
-import shutil
+import signal
 import socket
 import subprocess
+import time
 
 from datetime import datetime
 from enum import Enum
 
+from models.utils import Model
+from utilities.fileops import FileOperations
+
 
 def remember_me(user, path):
     with open(path, 'bw') as file:
@@ -200,53 +205,142 @@ def run_terminal_command(command, wait=True):
         raise e
 
 
-# TODO: this should be moved to become a class instead
-def recursive_op_files(source, destination, source_pattern, override=False, skip_dir=True, operation='copy'):
-    files_count = 0
+class CommandResult(Model):
+    def __init__(self, command, returncode=None, stdout='', stderr='', timed_out=False, error=None, duration=0.0):
+        self.command = command
+        self.returncode = returncode
+        self.stdout = stdout
+        self.stderr = stderr
+        self.timed_out = timed_out
+        self.error = error
+        self.duration = duration
+
+    @property
+    def ok(self):
+        return self.error is None and not self.timed_out and self.returncode == 0
+
+
+async def _read_stream(stream, name, command, chunks, on_output, chunk_size=64 * 1024):
+    # Fixed-size reads rather than readline(), which fails on lines longer than the stream buffer
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    pending = ''
+    while True:
+        data = await stream.read(chunk_size)
+        text = decoder.decode(data, final=not data)
+        chunks.append(text)
+        if on_output:
+            pending += text
+            *lines, pending = pending.split('\n')
+            for line in lines:
+                on_output(command, name, line)
+            if not data and pending:
+                on_output(command, name, pending)
+        if not data:
+            return
+
+
+def _kill_process(process):
+    # The command runs under a shell in its own session; kill the whole group so its children go too
     try:
-        assert source is not None, 'Please specify source path, Current source is None.'
-        assert destination is not None, 'Please specify destination path, Current source is None.'
-
-        if not os.path.exists(destination):
-            print(f'Creating Dir: {destination}')
-            os.mkdir(destination)
-
-        items = glob.glob(os.path.join(source, source_pattern))
-
-        for item in items:
-
-            try:
-                if os.path.isdir(item) and not skip_dir:
-                    path = os.path.join(destination, os.path.basename(item))
-                    # INFO(f'START {operation} FROM {item} TO {path}.')
-                    files_count += recursive_op_files(
-                        source=item, destination=path,
-                        source_pattern=source_pattern, override=override
-                    )
-                else:
-                    file = os.path.join(destination, os.path.basename(item))
-                    print(f'START {operation} FROM {item} TO {file}.')
-                    if not os.path.exists(file) or override:
-                        if operation == 'copy':
-                            shutil.copyfile(item, file)
-                        elif operation == 'move':
-                            shutil.move(item, file)
-                        else:
-                            raise ValueError(f"Invalid operation: {operation}")
-                        files_count += 1
-                    else:
-                        raise FileExistsError(f'The file {file} already exists int the destination path {destination}.')
-            except FileNotFoundError as e_file:
-                print(f"File not found error: {e_file}")
-            except PermissionError as e_permission:
-                print(f"Permission error: {e_permission}")
-            except Exception as e_inner:
-                print(f"An error occurred: {e_inner}")
-    except AssertionError as e_assert:
-        print(f"Assertion error: {e_assert}")
+        if os.name == 'posix':
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+    except ProcessLookupError:
+        pass
+
+
+async def _run_command_async(command, timeout, semaphore, on_output):
+    async with semaphore:
+        start = time.perf_counter()
+        stdout, stderr = [], []
+        try:
+            process = await asyncio.create_subprocess_shell(
+                command,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                start_new_session=os.name == 'posix',
+            )
+        except Exception as e:
+            return CommandResult(command, error=str(e), duration=time.perf_counter() - start)
+
+        timed_out = False
+        try:
+            await asyncio.wait_for(asyncio.gather(
+                _read_stream(process.stdout, 'stdout', command, stdout, on_output),
+                _read_stream(process.stderr, 'stderr', command, stderr, on_output),
+                process.wait(),
+            ), timeout)
+        except asyncio.TimeoutError:
+            timed_out = True
+            _kill_process(process)
+            await process.wait()
+        except asyncio.CancelledError:
+            _kill_process(process)
+            await process.wait()
+            raise
+        except Exception as e:
+            # e.g. raised by on_output: stop this command only, the others keep running
+            _kill_process(process)
+            await process.wait()
+            return CommandResult(
+                command, returncode=process.returncode, stdout=''.join(stdout), stderr=''.join(stderr),
+                error=str(e), duration=time.perf_counter() - start
+            )
+        return CommandResult(
+            command, returncode=process.returncode, stdout=''.join(stdout), stderr=''.join(stderr),
+            timed_out=timed_out, duration=time.perf_counter() - start
+        )
+
+
+async def run_terminal_commands_async(commands, max_parallel=8, timeout=None, on_output=None):
+    """
+    Run many shell commands concurrently as asyncio subprocesses, at most `max_parallel` at a time.
+
+    Args:
+    - commands (list): Command strings, or (command, timeout) tuples to override the default timeout.
+    - max_parallel (int): Maximum number of commands running at the same time.
+    - timeout (float): Seconds after which a command (and its child processes) is killed, None for no limit.
+    - on_output (callable): Called with (command, 'stdout' or 'stderr', line) as each output line is read.
+
+    Returns:
+    - list: One CommandResult per command, in the order of `commands`.
+    """
+    semaphore = asyncio.Semaphore(max_parallel)
+    tasks = []
+    for item in commands:
+        command, command_timeout = item if isinstance(item, tuple) else (item, timeout)
+        tasks.append(_run_command_async(command, command_timeout, semaphore, on_output))
+    return await asyncio.gather(*tasks)
+
+
+def run_terminal_commands(commands, max_parallel=8, timeout=None, on_output=None):
+    """Blocking wrapper around `run_terminal_commands_async` for callers without an event loop."""
+    return asyncio.run(run_terminal_commands_async(commands, max_parallel, timeout, on_output))
+
+
+def recursive_op_files(source, destination, source_pattern, override=False, skip_dir=True, operation='copy',
+                       max_workers=8, sync=False, delete=False):
+    """
+    Copy or move the files matching `source_pattern` from `source` to `destination`, keeping the sub-directory
+    layout when `skip_dir` is False. See `utilities.fileops.FileOperations` for the per-file results.
+
+    With `sync`, only the files that are new or modified since the previous sync are copied, and `delete`
+    removes the destination files that are no longer in the source.
+
+    Returns:
+    - int: The number of files copied or moved.
+    """
+    try:
+        engine = FileOperations(operation=operation, override=override, skip_dir=skip_dir, max_workers=max_workers)
+        if sync:
+            results = engine.sync(source, destination, source_pattern, delete=delete)
+        else:
+            results = engine.run(source, destination, source_pattern)
     except Exception as e_outer:
         print(f"An error occurred: {e_outer}")
-    return files_count
+        return 0
+    return sum(1 for result in results if result.ok)
 
 
 def convert_to_json(items):